@@ -0,0 +1,2 @@
+# MagiStock Benchmarks
+# Microbenchmarks for shared/ indicators and strategies, checked against reference oracles
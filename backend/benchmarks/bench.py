@@ -0,0 +1,419 @@
+"""
+MagiStock — Indicator & backtest microbenchmarks
+
+Times every public function in `shared/indicators.py` and
+`shared/strategies.py` across series lengths and universe sizes, and checks
+each fast path against the per-bar reference in `benchmarks/reference.py`
+before timing it. Results are emitted as JSON so runs can be diffed across
+commits.
+
+Usage:
+  cd backend
+  python -m benchmarks.bench --out bench.json
+  python -m benchmarks.bench --quick --only rsi
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks import reference as ref
+from shared import indicators as ind
+from shared import strategies as strat
+from shared.indicator_cache import indicator_cache
+
+
+DEFAULT_BARS = (252, 10_000, 1_000_000)
+DEFAULT_ASSETS = (1, 10, 100, 1_000, 10_000)
+QUICK_BARS = (252, 2_000)
+QUICK_ASSETS = (1, 10)
+BATCH_BARS = 252
+
+
+# ─── Cases ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class Case:
+    """
+    One benchmarked function.
+
+    mode "prefix": the function is causal, so its output on the full series
+      must agree with the reference on a prefix (cheap oracle at any size).
+    mode "tail": only the last value matters; compared with the reference
+      evaluated on the trailing `oracle_bars` bars.
+    mode "whole": both sides run on the same capped input (backtests).
+    mode "batch": rows of the batch output against the reference per row.
+    """
+
+    name: str
+    fast: Callable[[Any], Any]
+    oracle: Optional[Callable[[Any], Any]]
+    mode: str
+    rtol: float = 1e-8
+    atol: float = 1e-10
+    tags: tuple[str, ...] = field(default_factory=tuple)
+    # Untimed input preparation (e.g. signals for the simulator)
+    prepare: Callable[[Any], Any] = lambda data: data
+
+
+def _last(series):
+    return series[-1]
+
+
+def _with_signals(prices) -> tuple[list[float], list[int]]:
+    with np.errstate(invalid="ignore"):
+        signals = (ind.sma_array(prices, 10) > ind.sma_array(prices, 30)).astype(int)
+    return prices, signals.tolist()
+
+
+# Half-size entries, a 5% trailing stop and one entry per 63-bar "day", so
+# every constraint binds on the benchmark series
+_CONSTRAINTS = dict(
+    position_cap=0.5, stop_loss="trailing_pct", stop_pct=0.05, max_trades_per_day=1, bars_per_day=63,
+)
+
+
+def _series_cases() -> list[Case]:
+    lags = (1, 2, 3, 4, 5)
+    return [
+        Case("sma", lambda p: ind.sma(p, 20), lambda p: ref.sma(p, 20), "prefix"),
+        Case("sma_array", lambda p: ind.sma_array(p, 20), lambda p: ref.sma(p, 20), "prefix"),
+        Case("ema", lambda p: ind.ema(p, 12), lambda p: ref.ema(p, 12), "prefix"),
+        Case("ema_array", lambda p: ind.ema_array(p, 12), lambda p: ref.ema(p, 12), "prefix"),
+        Case("rsi", lambda p: ind.rsi(p, 14), lambda p: ref.rsi(p, 14), "prefix"),
+        Case("rsi_array", lambda p: ind.rsi_array(p, 14), lambda p: ref.rsi(p, 14), "prefix"),
+        Case("bollinger_bands", lambda p: ind.bollinger_bands(p, 20), lambda p: ref.bollinger_bands(p, 20), "prefix"),
+        Case(
+            "bollinger_bands_array",
+            lambda p: ind.bollinger_bands_array(p, 20),
+            lambda p: ref.bollinger_bands(p, 20),
+            "prefix",
+        ),
+        Case("macd", lambda p: ind.macd(p), lambda p: ref.macd(p), "prefix"),
+        Case("macd_array", lambda p: ind.macd_array(p), lambda p: ref.macd(p), "prefix"),
+        Case(
+            "rolling_volatility",
+            lambda p: ind.rolling_volatility(p, 20),
+            lambda p: ref.rolling_volatility(p, 20),
+            "prefix",
+        ),
+        Case(
+            "rolling_volatility_array",
+            lambda p: ind.rolling_volatility_array(p, 20),
+            lambda p: ref.rolling_volatility(p, 20),
+            "prefix",
+        ),
+        Case("autocorrelation", lambda p: ind.autocorrelation(p, 20), lambda p: ref.autocorrelation(p, 20), "prefix"),
+        Case(
+            "autocorrelation_array",
+            lambda p: ind.autocorrelation_array(p, 20),
+            lambda p: ref.autocorrelation(p, 20),
+            "prefix",
+        ),
+        Case(
+            "rolling_slope_array",
+            lambda p: ind.rolling_slope_array(p, 30),
+            lambda p: ref.rolling_slope(p, 30),
+            "prefix",
+        ),
+        Case(
+            "autocorrelations_array",
+            lambda p: tuple(ind.autocorrelations_array(p, 20, lags).values()),
+            lambda p: tuple(ref.autocorrelation(p, 20, lag) for lag in lags),
+            "prefix",
+        ),
+        Case("sma_tail", lambda p: ind.sma_tail(p, 20), lambda p: _last(ref.sma(p, 20)), "tail"),
+        Case("ema_tail", lambda p: ind.ema_tail(p, 12), lambda p: _last(ref.ema(p, 12)), "tail", rtol=1e-5),
+        Case("rsi_tail", lambda p: ind.rsi_tail(p, 14), lambda p: _last(ref.rsi(p, 14)), "tail", atol=1e-3),
+        Case(
+            "bollinger_bands_tail",
+            lambda p: ind.bollinger_bands_tail(p, 20),
+            lambda p: tuple(_last(b) for b in ref.bollinger_bands(p, 20)),
+            "tail",
+        ),
+        Case(
+            "rolling_volatility_tail",
+            lambda p: ind.rolling_volatility_tail(p, 20),
+            lambda p: _last(ref.rolling_volatility(p, 20)),
+            "tail",
+        ),
+        Case(
+            "autocorrelation_tail",
+            lambda p: ind.autocorrelation_tail(p, 20),
+            lambda p: _last(ref.autocorrelation(p, 20)),
+            "tail",
+        ),
+        Case(
+            "_simulate_portfolio",
+            lambda d: strat._simulate_portfolio(*d),
+            lambda d: ref.simulate_portfolio(*d),
+            "whole",
+            prepare=_with_signals,
+        ),
+        Case("momentum_backtest", strat.momentum_backtest, ref.momentum_backtest, "whole", tags=("cache",)),
+        Case("conservative_backtest", strat.conservative_backtest, ref.conservative_backtest, "whole", tags=("cache",)),
+        Case("adaptive_backtest", strat.adaptive_backtest, ref.adaptive_backtest, "whole", tags=("cache",)),
+        Case("detect_regime", strat.detect_regime, ref.detect_regime, "whole"),
+        Case("rolling_regime", strat.rolling_regime, ref.rolling_regime, "prefix", atol=1.01e-4, tags=("cache",)),
+        Case("run_strategy_suite", strat.run_strategy_suite, ref.run_strategy_suite, "whole", tags=("cache",)),
+        Case(
+            "walk_forward_backtest",
+            lambda p: strat.walk_forward_backtest(p, "adaptive", train_bars=126, test_bars=42),
+            lambda p: ref.walk_forward_backtest(p, "adaptive", train_bars=126, test_bars=42),
+            "whole",
+            atol=1.01e-4,
+            tags=("cache",),
+        ),
+        Case(
+            "constrained_backtest",
+            lambda p: strat.constrained_backtest(p, "momentum", **_CONSTRAINTS),
+            lambda p: ref.constrained_backtest(p, "momentum", **_CONSTRAINTS),
+            "whole",
+            tags=("cache",),
+        ),
+    ]
+
+
+def _batch_cases() -> list[Case]:
+    return [
+        Case("batch_sma", lambda m: ind.batch_sma(m, 20), lambda p: ref.sma(p, 20), "batch"),
+        Case("batch_ema", lambda m: ind.batch_ema(m, 12), lambda p: ref.ema(p, 12), "batch"),
+        Case("batch_rsi", lambda m: ind.batch_rsi(m, 14), lambda p: ref.rsi(p, 14), "batch"),
+        Case("batch_bollinger_bands", lambda m: ind.batch_bollinger_bands(m, 20), lambda p: ref.bollinger_bands(p, 20), "batch"),
+        Case("batch_macd", lambda m: ind.batch_macd(m), lambda p: ref.macd(p), "batch"),
+        Case(
+            "batch_rolling_volatility",
+            lambda m: ind.batch_rolling_volatility(m, 20),
+            lambda p: ref.rolling_volatility(p, 20),
+            "batch",
+        ),
+        Case(
+            "batch_rolling_slope",
+            lambda m: ind.batch_rolling_slope(m, 30),
+            lambda p: ref.rolling_slope(p, 30),
+            "batch",
+        ),
+        Case(
+            "batch_autocorrelation",
+            lambda m: ind.batch_autocorrelation(m, 20),
+            lambda p: ref.autocorrelation(p, 20),
+            "batch",
+        ),
+        Case(
+            "batch_autocorrelations",
+            lambda m: tuple(ind.batch_autocorrelations(m, 20, (1, 2, 3)).values()),
+            lambda p: tuple(ref.autocorrelation(p, 20, lag) for lag in (1, 2, 3)),
+            "batch",
+        ),
+    ]
+
+
+# ─── Oracle comparison ───────────────────────────────────────────────────────
+
+def _flatten(value) -> np.ndarray:
+    """Any indicator/backtest output → flat float64 array (None → NaN)."""
+    if value is None:
+        return np.array([np.nan])
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return np.concatenate([_flatten(v) for _, v in sorted(value.items())]) if value else np.array([])
+    if isinstance(value, str):
+        return np.array([float(zlib.crc32(value.encode()))])
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "US":
+            return np.array([float(zlib.crc32(str(v).encode())) for v in value.ravel()])
+        return value.astype(float).ravel()
+    if isinstance(value, (tuple, list)):
+        if value and all(isinstance(v, (int, float, type(None), np.floating)) for v in value):
+            return np.array([np.nan if v is None else v for v in value], dtype=float)
+        return np.concatenate([_flatten(v) for v in value]) if value else np.array([])
+    return np.array([float(value)])
+
+
+def _truncate(value, n: int):
+    """First n bars of every series in an indicator output."""
+    if isinstance(value, dict):
+        return {k: _truncate(v, n) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_truncate(v, n) for v in value)
+    return value[:n]
+
+
+def _row(value, r: int):
+    if isinstance(value, tuple):
+        return tuple(_row(v, r) for v in value)
+    return value[r]
+
+
+def _compare(actual, expected, case: Case) -> dict:
+    a, e = _flatten(actual), _flatten(expected)
+    if a.shape != e.shape:
+        return {"checked": True, "ok": False, "reason": f"shape {a.shape} != {e.shape}"}
+    nan_match = bool(np.array_equal(np.isnan(a), np.isnan(e)))
+    both = ~(np.isnan(a) | np.isnan(e))
+    diff = np.abs(a[both] - e[both])
+    scale = np.abs(e[both])
+    max_abs = float(diff.max()) if diff.size else 0.0
+    max_rel = float((diff / np.maximum(scale, 1e-300)).max()) if diff.size else 0.0
+    within = bool(np.all(diff <= case.atol + case.rtol * scale))
+    return {
+        "checked": True,
+        "ok": nan_match and within,
+        "max_abs_err": max_abs,
+        "max_rel_err": max_rel,
+    }
+
+
+def _check(case: Case, data, oracle_bars: int) -> dict:
+    if case.oracle is None:
+        return {"checked": False, "ok": True}
+    if case.mode == "prefix":
+        n = min(len(data), oracle_bars)
+        return _compare(_truncate(case.fast(data), n), case.oracle(data[:n]), case)
+    if case.mode == "tail":
+        return _compare(case.fast(data), case.oracle(data[-oracle_bars:]), case)
+    if case.mode == "whole":
+        capped = case.prepare(data[:oracle_bars])
+        return _compare(case.fast(capped), case.oracle(capped), case)
+    if case.mode == "batch":
+        out = case.fast(data)
+        rows = min(3, data.shape[0])
+        return _compare(
+            tuple(_row(out, r) for r in range(rows)),
+            tuple(case.oracle(data[r].tolist()) for r in range(rows)),
+            case,
+        )
+    raise ValueError(f"unknown mode: {case.mode}")
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+def _gbm_series(n: int, seed: int = 0) -> list[float]:
+    rng = np.random.RandomState(seed)
+    return (450.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))).tolist()
+
+
+def _gbm_matrix(assets: int, bars: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.RandomState(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, (assets, bars)), axis=1))
+
+
+def _time(fn: Callable[[], Any], repeat: int, before: Optional[Callable[[], None]] = None) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(
+    bars=DEFAULT_BARS,
+    assets=DEFAULT_ASSETS,
+    repeat: int = 3,
+    oracle_bars: int = 10_000,
+    only: Optional[str] = None,
+) -> dict:
+    """Run every case at every size; returns the JSON-ready report."""
+    results = []
+
+    def record(case: Case, data, n_bars: int, n_assets: int) -> None:
+        check = _check(case, data, oracle_bars)
+        reps = 1 if n_bars * n_assets >= 1_000_000 else repeat
+        # Backtests are timed cold, otherwise the indicator cache would hide the work
+        before = indicator_cache.clear if "cache" in case.tags else None
+        prepared = case.prepare(data)
+        seconds = _time(lambda: case.fast(prepared), reps, before)
+        results.append(
+            {
+                "name": case.name,
+                "bars": n_bars,
+                "assets": n_assets,
+                "seconds": seconds,
+                "bars_per_second": n_bars * n_assets / seconds if seconds > 0 else None,
+                "repeat": reps,
+                "oracle": check,
+            }
+        )
+
+    for n in bars:
+        prices = _gbm_series(n)
+        for case in _series_cases():
+            if only is None or only in case.name:
+                record(case, prices, n, 1)
+
+    for a in assets:
+        matrix = _gbm_matrix(a, BATCH_BARS)
+        for case in _batch_cases():
+            if only is None or only in case.name:
+                record(case, matrix, BATCH_BARS, a)
+
+    return {
+        "meta": {
+            "commit": _commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "bars": list(bars),
+            "assets": list(assets),
+            "oracle_bars": oracle_bars,
+        },
+        "results": results,
+        "all_oracles_ok": all(r["oracle"]["ok"] for r in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MagiStock indicator/backtest microbenchmarks")
+    parser.add_argument("--bars", type=int, nargs="+", default=None, help="Series lengths")
+    parser.add_argument("--assets", type=int, nargs="+", default=None, help="Batch universe sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing repeats")
+    parser.add_argument("--oracle-bars", type=int, default=10_000, help="Max bars fed to the reference")
+    parser.add_argument("--only", default=None, help="Only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a smoke run")
+    parser.add_argument("--out", default="-", help="Output JSON path ('-' for stdout)")
+    args = parser.parse_args()
+
+    bars = args.bars or (QUICK_BARS if args.quick else DEFAULT_BARS)
+    assets = args.assets or (QUICK_ASSETS if args.quick else DEFAULT_ASSETS)
+    report = run_suite(bars, assets, args.repeat, args.oracle_bars, args.only)
+
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        Path(args.out).write_text(text + "\n")
+    sys.exit(0 if report["all_oracles_ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
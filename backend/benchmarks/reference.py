@@ -0,0 +1,623 @@
+"""
+MagiStock — Reference implementations (benchmark oracles)
+
+Straightforward per-bar formulations of every indicator and strategy, kept
+as the correctness baseline for the fast paths in `shared/`. Deliberately
+slow and simple: one window slice / one loop step at a time. Do not
+optimize this module.
+"""
+
+import numpy as np
+from typing import Optional
+
+from shared.schemas import BacktestResult, WalkForwardWindow
+
+
+# ─── Indicators ──────────────────────────────────────────────────────────────
+
+def sma(prices: list[float], window: int) -> list[Optional[float]]:
+    """Simple Moving Average."""
+    result = [None] * len(prices)
+    arr = np.array(prices)
+    for i in range(window - 1, len(arr)):
+        result[i] = float(np.mean(arr[i - window + 1 : i + 1]))
+    return result
+
+
+def ema(prices: list[float], window: int) -> list[Optional[float]]:
+    """Exponential Moving Average."""
+    result = [None] * len(prices)
+    arr = np.array(prices, dtype=float)
+    multiplier = 2.0 / (window + 1)
+
+    # Start with SMA for first value
+    if len(arr) < window:
+        return result
+
+    result[window - 1] = float(np.mean(arr[:window]))
+    for i in range(window, len(arr)):
+        result[i] = (arr[i] - result[i - 1]) * multiplier + result[i - 1]
+
+    return result
+
+
+def rsi(prices: list[float], window: int = 14) -> list[Optional[float]]:
+    """Relative Strength Index (0-100)."""
+    result = [None] * len(prices)
+    if len(prices) < window + 1:
+        return result
+
+    arr = np.array(prices, dtype=float)
+    deltas = np.diff(arr)
+
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    avg_gain = float(np.mean(gains[:window]))
+    avg_loss = float(np.mean(losses[:window]))
+
+    for i in range(window, len(deltas)):
+        avg_gain = (avg_gain * (window - 1) + gains[i]) / window
+        avg_loss = (avg_loss * (window - 1) + losses[i]) / window
+
+        if avg_loss == 0:
+            result[i + 1] = 100.0
+        else:
+            rs = avg_gain / avg_loss
+            result[i + 1] = 100.0 - (100.0 / (1.0 + rs))
+
+    # Fill the first RSI value
+    if avg_loss == 0:
+        result[window] = 100.0
+    else:
+        rs = float(np.mean(gains[:window])) / float(np.mean(losses[:window]))
+        result[window] = 100.0 - (100.0 / (1.0 + rs))
+
+    return result
+
+
+def bollinger_bands(
+    prices: list[float], window: int = 20, num_std: float = 2.0
+) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
+    """Bollinger Bands: (upper, middle, lower)."""
+    middle = sma(prices, window)
+    upper = [None] * len(prices)
+    lower = [None] * len(prices)
+    arr = np.array(prices, dtype=float)
+
+    for i in range(window - 1, len(arr)):
+        std = float(np.std(arr[i - window + 1 : i + 1]))
+        if middle[i] is not None:
+            upper[i] = middle[i] + num_std * std
+            lower[i] = middle[i] - num_std * std
+
+    return upper, middle, lower
+
+
+def macd(
+    prices: list[float], fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[list[Optional[float]], list[Optional[float]]]:
+    """MACD: (macd_line, signal_line)."""
+    fast_ema = ema(prices, fast)
+    slow_ema = ema(prices, slow)
+
+    macd_line = [None] * len(prices)
+    for i in range(len(prices)):
+        if fast_ema[i] is not None and slow_ema[i] is not None:
+            macd_line[i] = fast_ema[i] - slow_ema[i]
+
+    # Signal line is EMA of MACD values
+    valid_macd = [v for v in macd_line if v is not None]
+    if len(valid_macd) < signal:
+        return macd_line, [None] * len(prices)
+
+    signal_values = ema(valid_macd, signal)
+    signal_line = [None] * len(prices)
+
+    valid_idx = 0
+    for i in range(len(prices)):
+        if macd_line[i] is not None:
+            if valid_idx < len(signal_values):
+                signal_line[i] = signal_values[valid_idx]
+            valid_idx += 1
+
+    return macd_line, signal_line
+
+
+def rolling_volatility(prices: list[float], window: int = 20) -> list[Optional[float]]:
+    """Rolling annualized volatility of returns."""
+    result = [None] * len(prices)
+    if len(prices) < window + 1:
+        return result
+
+    arr = np.array(prices, dtype=float)
+    returns = np.diff(np.log(arr))
+
+    for i in range(window, len(returns) + 1):
+        vol = float(np.std(returns[i - window : i]) * np.sqrt(252))
+        result[i] = vol
+
+    return result
+
+
+def autocorrelation(prices: list[float], window: int = 20, lag: int = 1) -> list[Optional[float]]:
+    """Rolling autocorrelation of returns (used for regime detection)."""
+    result = [None] * len(prices)
+    if len(prices) < window + lag + 1:
+        return result
+
+    arr = np.array(prices, dtype=float)
+    returns = np.diff(np.log(arr))
+
+    for i in range(window + lag, len(returns) + 1):
+        r = returns[i - window : i]
+        r_lagged = returns[i - window - lag : i - lag]
+        if len(r) == len(r_lagged) and len(r) > 0:
+            corr = float(np.corrcoef(r, r_lagged)[0, 1])
+            if not np.isnan(corr):
+                result[i] = corr
+
+    return result
+
+
+def rolling_slope(prices: list[float], window: int = 30) -> list[Optional[float]]:
+    """Rolling linear-regression slope of price against bar index."""
+    result = [None] * len(prices)
+    arr = np.array(prices, dtype=float)
+    x = np.arange(window)
+    for i in range(window - 1, len(arr)):
+        result[i] = float(np.polyfit(x, arr[i - window + 1 : i + 1], 1)[0])
+    return result
+
+
+# ─── Portfolio Simulator ─────────────────────────────────────────────────────
+
+def simulate_portfolio(
+    prices: list[float],
+    signals: list[int],
+    initial_capital: float = 10000.0,
+) -> BacktestResult:
+    """
+    Simulate a portfolio based on trading signals.
+
+    signals: list of int where 1 = buy/hold, 0 = cash, -1 = sell/short
+    Returns BacktestResult with all performance metrics.
+    """
+    capital = initial_capital
+    position = 0.0  # Number of shares held
+    trades = 0
+    trade_returns = []
+    entry_price = 0.0
+    portfolio_values = [initial_capital]
+
+    for i in range(1, len(prices)):
+        signal = signals[i] if i < len(signals) else 0
+
+        if signal == 1 and position == 0:
+            # Buy
+            position = capital / prices[i]
+            entry_price = prices[i]
+            capital = 0.0
+            trades += 1
+        elif signal <= 0 and position > 0:
+            # Sell
+            capital = position * prices[i]
+            trade_return = (prices[i] - entry_price) / entry_price
+            trade_returns.append(trade_return)
+            position = 0.0
+
+        # Track portfolio value
+        if position > 0:
+            portfolio_values.append(position * prices[i])
+        else:
+            portfolio_values.append(capital)
+
+    # Close any open position
+    if position > 0:
+        capital = position * prices[-1]
+        trade_return = (prices[-1] - entry_price) / entry_price
+        trade_returns.append(trade_return)
+        portfolio_values[-1] = capital
+
+    return _metrics(portfolio_values, trade_returns, trades, initial_capital)
+
+
+def _metrics(
+    portfolio_values: list[float],
+    trade_returns: list[float],
+    trades: int,
+    initial_capital: float,
+) -> BacktestResult:
+    """Performance metrics of a bar-by-bar equity curve and its closed trades."""
+    portfolio_arr = np.array(portfolio_values)
+    daily_returns = np.diff(portfolio_arr) / portfolio_arr[:-1]
+    daily_returns = daily_returns[~np.isnan(daily_returns)]
+
+    total_return = (portfolio_values[-1] - initial_capital) / initial_capital
+
+    # Max drawdown
+    peak = np.maximum.accumulate(portfolio_arr)
+    drawdowns = (portfolio_arr - peak) / peak
+    max_drawdown = float(np.min(drawdowns)) if len(drawdowns) > 0 else 0.0
+
+    # Annualized volatility
+    volatility = float(np.std(daily_returns) * np.sqrt(252)) if len(daily_returns) > 0 else 0.0
+
+    # Sharpe ratio (assuming risk-free rate of 4%)
+    risk_free_daily = 0.04 / 252
+    excess_returns = daily_returns - risk_free_daily
+    sharpe = float(np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)) if volatility > 0 else 0.0
+
+    # Win rate
+    winning = [r for r in trade_returns if r > 0]
+    win_rate = len(winning) / len(trade_returns) if trade_returns else 0.0
+
+    # Average trade return
+    avg_trade_return = float(np.mean(trade_returns)) if trade_returns else 0.0
+
+    return BacktestResult(
+        total_return=round(total_return, 4),
+        max_drawdown=round(max_drawdown, 4),
+        volatility=round(volatility, 4),
+        sharpe_ratio=round(sharpe, 2),
+        trades=trades,
+        win_rate=round(win_rate, 4),
+        avg_trade_return=round(avg_trade_return, 4),
+    )
+
+
+# ─── Momentum Strategy (Fire Agent) ─────────────────────────────────────────
+
+def momentum_signals(
+    prices: list[float],
+    fast_window: int = 10,
+    slow_window: int = 30,
+    rsi_window: int = 14,
+) -> list[int]:
+    """
+    Momentum / trend-following strategy.
+
+    Buy signal: Fast SMA crosses above Slow SMA AND RSI > 50
+    Sell signal: Fast SMA crosses below Slow SMA OR RSI < 40
+
+    Aggressive — favors trending markets, accepts high drawdowns.
+    """
+    fast_sma = sma(prices, fast_window)
+    slow_sma = sma(prices, slow_window)
+    rsi_values = rsi(prices, rsi_window)
+
+    signals = [0] * len(prices)
+    min_lookback = max(fast_window, slow_window, rsi_window + 1)
+
+    for i in range(min_lookback, len(prices)):
+        if fast_sma[i] is None or slow_sma[i] is None or rsi_values[i] is None:
+            continue
+
+        # Buy: golden cross + RSI confirmation
+        if fast_sma[i] > slow_sma[i] and rsi_values[i] > 50:
+            signals[i] = 1
+        # Sell: death cross or RSI oversold warning
+        elif fast_sma[i] < slow_sma[i] or rsi_values[i] < 40:
+            signals[i] = 0
+        else:
+            signals[i] = signals[i - 1]  # Hold previous position
+
+    return signals
+
+
+def momentum_backtest(
+    prices: list[float],
+    fast_window: int = 10,
+    slow_window: int = 30,
+    rsi_window: int = 14,
+) -> BacktestResult:
+    """`momentum_signals` run through the portfolio simulator."""
+    return simulate_portfolio(prices, momentum_signals(prices, fast_window, slow_window, rsi_window))
+
+
+# ─── Conservative Strategy (Water Agent) ─────────────────────────────────────
+
+def conservative_signals(
+    prices: list[float],
+    bb_window: int = 20,
+    bb_std: float = 2.0,
+    rsi_window: int = 14,
+) -> list[int]:
+    """
+    Capital-preservation / mean-reversion strategy.
+
+    Buy signal: Price near lower Bollinger Band AND RSI < 30 (oversold)
+    Sell signal: Price near upper Bollinger Band OR RSI > 70 (overbought)
+
+    Conservative — minimizes drawdown, favors sideways markets.
+    """
+    upper, middle, lower = bollinger_bands(prices, bb_window, bb_std)
+    rsi_values = rsi(prices, rsi_window)
+
+    signals = [0] * len(prices)
+    min_lookback = max(bb_window, rsi_window + 1)
+
+    for i in range(min_lookback, len(prices)):
+        if lower[i] is None or upper[i] is None or rsi_values[i] is None:
+            continue
+
+        # Buy: oversold near lower band
+        if prices[i] <= lower[i] * 1.02 and rsi_values[i] < 35:
+            signals[i] = 1
+        # Sell: overbought near upper band
+        elif prices[i] >= upper[i] * 0.98 or rsi_values[i] > 70:
+            signals[i] = 0
+        else:
+            signals[i] = signals[i - 1]  # Hold previous position
+
+    return signals
+
+
+def conservative_backtest(
+    prices: list[float],
+    bb_window: int = 20,
+    bb_std: float = 2.0,
+    rsi_window: int = 14,
+) -> BacktestResult:
+    """`conservative_signals` run through the portfolio simulator."""
+    return simulate_portfolio(prices, conservative_signals(prices, bb_window, bb_std, rsi_window))
+
+
+# ─── Adaptive Strategy (Grass Agent) ─────────────────────────────────────────
+
+def adaptive_signals(
+    prices: list[float],
+    regime_window: int = 30,
+    fast_window: int = 10,
+    slow_window: int = 30,
+    bb_window: int = 20,
+) -> list[int]:
+    """
+    Regime-switching adaptive strategy.
+
+    Detects market regime and switches approach:
+    - Trending: Use momentum (fast/slow SMA crossover)
+    - Mean-reverting: Use Bollinger Band mean-reversion
+    - High volatility: Stay in cash
+
+    Balanced — adjusts to market conditions, moderate risk.
+    """
+    vol = rolling_volatility(prices, regime_window)
+    autocorr = autocorrelation(prices, regime_window)
+    fast_sma = sma(prices, fast_window)
+    slow_sma = sma(prices, slow_window)
+    upper, middle, lower = bollinger_bands(prices, bb_window)
+    rsi_values = rsi(prices)
+
+    signals = [0] * len(prices)
+    min_lookback = max(regime_window + 1, slow_window, bb_window)
+
+    for i in range(min_lookback, len(prices)):
+        current_vol = vol[i]
+        current_autocorr = autocorr[i] if i < len(autocorr) else None
+
+        if current_vol is None:
+            continue
+
+        # Detect regime
+        if current_vol > 0.30:
+            # High volatility → stay in cash
+            signals[i] = 0
+        elif current_autocorr is not None and current_autocorr > 0.1:
+            # Positive autocorrelation → trending → use momentum
+            if fast_sma[i] is not None and slow_sma[i] is not None:
+                if fast_sma[i] > slow_sma[i]:
+                    signals[i] = 1
+                else:
+                    signals[i] = 0
+            else:
+                signals[i] = signals[i - 1]
+        else:
+            # Low autocorrelation → mean-reverting → use Bollinger
+            if lower[i] is not None and upper[i] is not None and rsi_values[i] is not None:
+                if prices[i] <= lower[i] * 1.02 and rsi_values[i] < 40:
+                    signals[i] = 1
+                elif prices[i] >= upper[i] * 0.98 or rsi_values[i] > 65:
+                    signals[i] = 0
+                else:
+                    signals[i] = signals[i - 1]
+            else:
+                signals[i] = signals[i - 1]
+
+    return signals
+
+
+def adaptive_backtest(
+    prices: list[float],
+    regime_window: int = 30,
+    fast_window: int = 10,
+    slow_window: int = 30,
+    bb_window: int = 20,
+) -> BacktestResult:
+    """`adaptive_signals` run through the portfolio simulator."""
+    return simulate_portfolio(prices, adaptive_signals(prices, regime_window, fast_window, slow_window, bb_window))
+
+
+def detect_regime(prices: list[float], window: int = 30) -> dict:
+    """
+    Detect the current market regime from price data.
+
+    Returns a dict with regime info for the Grass agent's Reasoner to analyze.
+    """
+    if len(prices) < window + 2:
+        return {
+            "regime": "unknown",
+            "volatility": 0.0,
+            "autocorrelation": 0.0,
+            "trend_strength": 0.0,
+        }
+
+    arr = np.array(prices, dtype=float)
+    returns = np.diff(np.log(arr))
+    recent_returns = returns[-window:]
+
+    current_vol = float(np.std(recent_returns) * np.sqrt(252))
+
+    # Autocorrelation
+    if len(recent_returns) > 1:
+        r1 = recent_returns[:-1]
+        r2 = recent_returns[1:]
+        current_autocorr = float(np.corrcoef(r1, r2)[0, 1])
+        if np.isnan(current_autocorr):
+            current_autocorr = 0.0
+    else:
+        current_autocorr = 0.0
+
+    # Trend strength (slope of linear regression on prices)
+    recent_prices = arr[-window:]
+    x = np.arange(window)
+    slope = float(np.polyfit(x, recent_prices, 1)[0])
+    trend_strength = slope / np.mean(recent_prices) * 252  # Annualized
+
+    # Classify regime
+    if current_vol > 0.30:
+        regime = "high_volatility"
+    elif abs(trend_strength) > 0.15 and current_autocorr > 0.05:
+        regime = "trending_up" if trend_strength > 0 else "trending_down"
+    else:
+        regime = "mean_reverting"
+
+    return {
+        "regime": regime,
+        "volatility": round(float(current_vol), 4),
+        "autocorrelation": round(float(current_autocorr), 4),
+        "trend_strength": round(float(trend_strength), 4),
+    }
+
+
+def rolling_regime(prices: list[float], window: int = 30) -> dict:
+    """`detect_regime` of every prefix prices[: i + 1]; NaN metrics while "unknown"."""
+    labels = {"regime": [], "volatility": [], "autocorrelation": [], "trend_strength": []}
+    for i in range(len(prices)):
+        # detect_regime only reads the last window + 2 bars
+        regime = detect_regime(prices[max(i - window - 1, 0) : i + 1], window)
+        labels["regime"].append(regime["regime"])
+        for key in ("volatility", "autocorrelation", "trend_strength"):
+            labels[key].append(np.nan if regime["regime"] == "unknown" else regime[key])
+    return labels
+
+
+# ─── Strategy Suite, Walk-Forward and Constraints ───────────────────────────
+
+STRATEGY_SIGNALS = {
+    "momentum": momentum_signals,
+    "conservative": conservative_signals,
+    "adaptive": adaptive_signals,
+}
+
+
+def run_strategy_suite(prices: list[float]) -> dict[str, BacktestResult]:
+    """Every strategy's backtest, keyed by name."""
+    return {name: simulate_portfolio(prices, signals(prices)) for name, signals in STRATEGY_SIGNALS.items()}
+
+
+def _window_result(prices: list[float], signals: list[int], start: int, end: int) -> BacktestResult:
+    """Bars [start, end) as an account that opens at `start` holding the live position."""
+    holding = signals[start] == 1
+    entry_price = prices[start]
+    trades = int(holding)
+    trade_returns = []
+    portfolio_values = [1.0]
+
+    for i in range(start + 1, end):
+        if holding:
+            portfolio_values.append(portfolio_values[-1] * prices[i] / prices[i - 1])
+        else:
+            portfolio_values.append(portfolio_values[-1])
+
+        if signals[i] == 1 and not holding:
+            holding, entry_price = True, prices[i]
+            trades += 1
+        elif signals[i] <= 0 and holding:
+            trade_returns.append((prices[i] - entry_price) / entry_price)
+            holding = False
+
+    if holding:
+        trade_returns.append((prices[end - 1] - entry_price) / entry_price)
+    return _metrics(portfolio_values, trade_returns, trades, 1.0)
+
+
+def walk_forward_backtest(
+    prices: list[float],
+    strategy: str = "momentum",
+    train_bars: int = 252,
+    test_bars: int = 63,
+    step: Optional[int] = None,
+    **params,
+) -> list[WalkForwardWindow]:
+    """Train and test windows, each simulated bar by bar as its own account."""
+    signals = STRATEGY_SIGNALS[strategy](prices, **params)
+    windows = []
+    for test_start in range(train_bars, len(prices) - test_bars + 1, step or test_bars):
+        train_start = test_start - train_bars
+        test_end = test_start + test_bars
+        windows.append(WalkForwardWindow(
+            train_start=train_start,
+            test_start=test_start,
+            test_end=test_end,
+            train=_window_result(prices, signals, train_start, test_start),
+            test=_window_result(prices, signals, test_start, test_end),
+        ))
+    return windows
+
+
+def constrained_equity(
+    prices: list[float],
+    signals: list[int],
+    position_cap: float,
+    stop_loss: str,
+    stop_pct: Optional[float],
+    max_trades_per_day: Optional[int],
+    bars_per_day: int,
+    initial_capital: float = 10000.0,
+) -> tuple[list[float], list[float]]:
+    """
+    Portfolio value per bar and trade returns under a position cap, a fixed or
+    trailing stop and a per-day entry limit. After a stop the signal has to
+    return to cash before the next entry.
+    """
+    limit = float("inf") if max_trades_per_day is None else max_trades_per_day
+    capital, cash, shares, entry, peak, armed = initial_capital, 0.0, 0.0, None, 0.0, True
+    day_trades, values, returns = {}, [capital], []
+    for i in range(1, len(prices)):
+        p = prices[i]
+        if entry is not None:
+            peak = max(peak, p)
+            stop_ref = prices[entry] if stop_loss == "fixed_pct" else peak
+            if signals[i] != 1 or (stop_loss != "none" and p <= stop_ref * (1 - stop_pct)):
+                armed = signals[i] != 1
+                capital = cash + shares * p
+                returns.append((p - prices[entry]) / prices[entry])
+                entry = None
+        elif signals[i] == 1 and armed and day_trades.get(i // bars_per_day, 0) < limit:
+            day_trades[i // bars_per_day] = day_trades.get(i // bars_per_day, 0) + 1
+            invested = capital * position_cap
+            cash, shares, entry, peak = capital - invested, invested / p, i, p
+        armed = armed or signals[i] != 1
+        values.append(cash + shares * p if entry is not None else capital)
+    if entry is not None:
+        returns.append((prices[-1] - prices[entry]) / prices[entry])
+    return values, returns
+
+
+def constrained_backtest(
+    prices: list[float],
+    strategy: str = "momentum",
+    position_cap: float = 1.0,
+    stop_loss: str = "none",
+    stop_pct: Optional[float] = None,
+    max_trades_per_day: Optional[int] = None,
+    bars_per_day: int = 1,
+    **params,
+) -> BacktestResult:
+    """A strategy's signals simulated under `constrained_equity`."""
+    signals = STRATEGY_SIGNALS[strategy](prices, **params)
+    values, returns = constrained_equity(
+        prices, signals, position_cap, stop_loss, stop_pct, max_trades_per_day, bars_per_day,
+    )
+    return _metrics(values, returns, len(returns), 10000.0)
@@ -89,12 +89,25 @@ class RiskGovernorEngine:
             # -----------------------------
             # Deterministic skills: fetch data -> indicators
             # -----------------------------
-            prices_blob = await self.app.call(
-                "fetch_market_data", budget=budget, asset=asset, window=252
-            )
-            indicators = await self.app.call(
-                "compute_indicators", budget=budget, prices=prices_blob["prices"]
+            # The asset's streaming state answers every event: a new daily
+            # close advances it by one bar, other events read it unchanged.
+            # Only an asset without state is seeded from history, with the
+            # event's close appended so it is not lost.
+            closes = [event.close] if event.close is not None else []
+            indicators: Optional[dict[str, Any]] = await self.app.call(
+                "update_indicators", budget=budget, asset=asset, prices=closes
             )
+            if indicators is None:
+                prices_blob = await self.app.call(
+                    "fetch_market_data", budget=budget, asset=asset, window=252
+                )
+                indicators = await self.app.call(
+                    "update_indicators",
+                    budget=budget,
+                    asset=asset,
+                    prices=prices_blob["prices"] + closes,
+                    seed=True,
+                )
 
             # -----------------------------
             # Guided autonomy loop (bounded, non-DAG)
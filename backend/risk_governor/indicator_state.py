@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+# Running sums are rebuilt from their buffers this often to stop float drift.
+_RESYNC_EVERY = 1024
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    volatility: float
+    max_drawdown: float
+    momentum_20d: float
+    rsi_14: float
+    trend_slope: float
+
+
+@dataclass
+class IndicatorState:
+    """
+    Streaming per-asset indicator state with O(1) `update(price)`.
+
+    Mirrors `compute_indicators` over the last `drawdown_window` bars (the
+    engine's 252-day history): Wilder RSI, EMA, rolling annualized volatility
+    of log returns, max drawdown within the window, N-bar momentum and an OLS
+    trend slope over the last `slope_window` prices. Every price is one bar
+    (a daily close); the drawdown is re-measured over its window when read.
+    """
+
+    rsi_window: int = 14
+    ema_window: int = 20
+    vol_window: int = 20
+    momentum_window: int = 20
+    slope_window: int = 30
+    drawdown_window: int = 252
+    periods_per_year: float = 252.0
+
+    count: int = 0
+    last_price: Optional[float] = None
+    ema: Optional[float] = None
+
+    _avg_gain: float = 0.0
+    _avg_loss: float = 0.0
+    _ema_seed: float = 0.0
+    _vol_mean: float = 0.0
+    _vol_m2: float = 0.0
+    _slope_sy: float = 0.0
+    _slope_sxy: float = 0.0
+    _returns: deque = field(default_factory=deque)
+    _window_prices: deque = field(default_factory=deque)
+    _momentum_prices: deque = field(default_factory=deque)
+    _drawdown_prices: deque = field(default_factory=deque)
+
+    @classmethod
+    def from_prices(cls, prices: Iterable[float], **params) -> "IndicatorState":
+        state = cls(**params)
+        state.extend(prices)
+        return state
+
+    def extend(self, prices: Iterable[float]) -> None:
+        for p in prices:
+            self.update(p)
+
+    def update(self, price: float) -> None:
+        price = float(price)
+        prev = self.last_price
+        self.count += 1
+        self.last_price = price
+
+        # EMA (seeded with the SMA of the first window)
+        if self.count <= self.ema_window:
+            self._ema_seed += price
+            if self.count == self.ema_window:
+                self.ema = self._ema_seed / self.ema_window
+        else:
+            alpha = 2.0 / (self.ema_window + 1)
+            self.ema = (price - self.ema) * alpha + self.ema
+
+        if prev is not None:
+            self._update_rsi(price - prev)
+            self._update_volatility(math.log(price / prev))
+
+        self._momentum_prices.append(price)
+        if len(self._momentum_prices) > self.momentum_window + 1:
+            self._momentum_prices.popleft()
+
+        self._drawdown_prices.append(price)
+        if len(self._drawdown_prices) > self.drawdown_window:
+            self._drawdown_prices.popleft()
+
+        self._update_slope(price)
+
+        if self.count % _RESYNC_EVERY == 0:
+            self._resync()
+
+    # ─── Components ──────────────────────────────────────────────────────────
+
+    def _update_rsi(self, delta: float) -> None:
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        n_deltas = self.count - 1
+        w = self.rsi_window
+        if n_deltas <= w:
+            # Seed phase: simple average of the first `w` deltas
+            self._avg_gain += gain / w
+            self._avg_loss += loss / w
+        else:
+            self._avg_gain = (self._avg_gain * (w - 1) + gain) / w
+            self._avg_loss = (self._avg_loss * (w - 1) + loss) / w
+
+    def _update_volatility(self, ret: float) -> None:
+        w = self.vol_window
+        self._returns.append(ret)
+        if len(self._returns) <= w:
+            # Welford add
+            n = len(self._returns)
+            d = ret - self._vol_mean
+            self._vol_mean += d / n
+            self._vol_m2 += d * (ret - self._vol_mean)
+        else:
+            # Sliding Welford: add `ret`, drop the oldest return
+            old = self._returns.popleft()
+            new_mean = self._vol_mean + (ret - old) / w
+            self._vol_m2 += (ret - old) * (ret - new_mean + old - self._vol_mean)
+            self._vol_mean = new_mean
+
+    def _update_slope(self, price: float) -> None:
+        w = self.slope_window
+        self._window_prices.append(price)
+        n = len(self._window_prices)
+        if n <= w:
+            self._slope_sy += price
+            self._slope_sxy += (n - 1) * price
+        else:
+            old = self._window_prices.popleft()
+            # Every remaining x shifts down by one; the new price lands at w - 1
+            self._slope_sxy += -(self._slope_sy - old) + (w - 1) * price
+            self._slope_sy += price - old
+
+    def _resync(self) -> None:
+        if self._returns:
+            n = len(self._returns)
+            self._vol_mean = sum(self._returns) / n
+            self._vol_m2 = sum((r - self._vol_mean) ** 2 for r in self._returns)
+        self._slope_sy = sum(self._window_prices)
+        self._slope_sxy = sum(j * p for j, p in enumerate(self._window_prices))
+
+    # ─── Readouts ────────────────────────────────────────────────────────────
+
+    @property
+    def rsi(self) -> Optional[float]:
+        if self.count < self.rsi_window + 1:
+            return None
+        if self._avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+    @property
+    def volatility(self) -> Optional[float]:
+        if len(self._returns) < self.vol_window:
+            return None
+        return math.sqrt(max(self._vol_m2, 0.0) / self.vol_window) * math.sqrt(self.periods_per_year)
+
+    @property
+    def max_drawdown(self) -> float:
+        if not self._drawdown_prices:
+            return 0.0
+        # One vectorized pass over the window per read; updates stay O(1)
+        arr = np.fromiter(self._drawdown_prices, dtype=float, count=len(self._drawdown_prices))
+        peak = np.maximum.accumulate(arr)
+        return float(np.min((arr - peak) / peak))
+
+    @property
+    def momentum(self) -> float:
+        if len(self._momentum_prices) < self.momentum_window + 1:
+            return 0.0
+        start = self._momentum_prices[0]
+        if start <= 0:
+            return 0.0
+        return (self._momentum_prices[-1] - start) / start
+
+    @property
+    def trend_slope(self) -> float:
+        w = self.slope_window
+        if len(self._window_prices) < w:
+            return 0.0
+        sx = w * (w - 1) / 2.0
+        sxx = (w - 1) * w * (2 * w - 1) / 6.0
+        denom = w * sxx - sx * sx
+        slope = (w * self._slope_sxy - sx * self._slope_sy) / denom if denom else 0.0
+        mean = self._slope_sy / w
+        return slope / mean if mean else 0.0
+
+    def snapshot(self) -> IndicatorSnapshot:
+        rsi = self.rsi
+        vol = self.volatility
+        return IndicatorSnapshot(
+            volatility=round(vol if vol is not None else 0.0, 4),
+            max_drawdown=round(self.max_drawdown, 4),
+            momentum_20d=round(self.momentum, 4),
+            rsi_14=round(rsi if rsi is not None else 50.0, 2),
+            trend_slope=round(self.trend_slope, 6),
+        )
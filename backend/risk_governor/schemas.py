@@ -35,6 +35,11 @@ class MarketEvent(BaseModel):
     event_type: Literal["price_jump", "vol_spike", "regime_hint", "crash_signal", "heartbeat"]
     severity: float = Field(ge=0.0, le=1.0, default=0.2)
     details: dict[str, Any] = Field(default_factory=dict)
+    close: Optional[float] = Field(
+        default=None,
+        gt=0.0,
+        description="New daily close; advances the asset's streaming indicators by one bar",
+    )
     occurred_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -1,33 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import asdict
 from typing import Any, Literal, Optional
 
 import numpy as np
 
+from .indicator_state import IndicatorSnapshot, IndicatorState
 from .runtime import AgentFieldLiteApp
 from .schemas import StopLossPolicy, StrategyConstraints
 
 # Reuse existing deterministic utilities where possible
 from shared.market_data import fetch_market_data as _fetch_prices
-from shared.indicators import rsi as _rsi_series, rolling_volatility as _roll_vol_series
-from shared.strategies import (
-    adaptive_backtest,
-    conservative_backtest,
-    momentum_backtest,
-)
+from shared.indicator_cache import indicator_cache, price_fingerprint
+from shared.indicators import rolling_volatility_tail, rsi_tail
+from shared.strategies import constrained_backtest
 
 
 StrategyId = Literal["fire", "water", "grass"]
 
-
-@dataclass(frozen=True)
-class IndicatorSnapshot:
-    volatility: float
-    max_drawdown: float
-    momentum_20d: float
-    rsi_14: float
-    trend_slope: float
+_BACKTEST_STRATEGIES: dict[str, str] = {
+    "fire": "momentum",
+    "water": "conservative",
+    "grass": "adaptive",
+}
 
 
 def _max_drawdown(prices: list[float]) -> float:
@@ -53,12 +48,17 @@ def _trend_slope(prices: list[float], window: int = 30) -> float:
     if len(prices) < window:
         return 0.0
     y = np.array(prices[-window:], dtype=float)
-    x = np.arange(window, dtype=float)
-    slope = float(np.polyfit(x, y, 1)[0])
-    return slope / float(np.mean(y)) if float(np.mean(y)) else 0.0
+    x = np.arange(window, dtype=float) - (window - 1) / 2.0
+    mean = float(np.mean(y))
+    # Closed-form OLS slope on centered x (same fit as np.polyfit(x, y, 1))
+    slope = float(np.dot(x, y - mean) / np.dot(x, x)) if window > 1 else 0.0
+    return slope / mean if mean else 0.0
 
 
 def register(app: AgentFieldLiteApp) -> None:
+    # Per-asset streaming indicator state, kept for the lifetime of the app.
+    indicator_states: dict[str, IndicatorState] = {}
+
     @app.skill(tags=["market"])
     def fetch_market_data(asset: str, window: int = 252) -> dict[str, Any]:
         prices = _fetch_prices(asset, period_days=int(window))
@@ -66,24 +66,50 @@ def register(app: AgentFieldLiteApp) -> None:
 
     @app.skill(tags=["indicators"])
     def compute_indicators(prices: list[float]) -> dict[str, Any]:
-        rsi_series = _rsi_series(prices, window=14)
-        vol_series = _roll_vol_series(prices, window=20)
-
-        rsi_14 = float(next((v for v in reversed(rsi_series) if v is not None), 50.0))
-        vol = float(next((v for v in reversed(vol_series) if v is not None), 0.0))
-        dd = float(_max_drawdown(prices))
-        mom20 = float(_momentum(prices, window=20))
-        slope = float(_trend_slope(prices, window=30))
-
-        snap = IndicatorSnapshot(
-            volatility=round(vol, 4),
-            max_drawdown=round(dd, 4),
-            momentum_20d=round(mom20, 4),
-            rsi_14=round(rsi_14, 2),
-            trend_slope=round(slope, 6),
-        )
+        def snapshot() -> IndicatorSnapshot:
+            # Only the latest values are needed: evaluate from the minimum look-back
+            rsi_14 = rsi_tail(prices, window=14)
+            vol = rolling_volatility_tail(prices, window=20)
+            rsi_14 = float(rsi_14) if rsi_14 is not None else 50.0
+            vol = float(vol) if vol is not None else 0.0
+            dd = float(_max_drawdown(prices))
+            mom20 = float(_momentum(prices, window=20))
+            slope = float(_trend_slope(prices, window=30))
+
+            return IndicatorSnapshot(
+                volatility=round(vol, 4),
+                max_drawdown=round(dd, 4),
+                momentum_20d=round(mom20, 4),
+                rsi_14=round(rsi_14, 2),
+                trend_slope=round(slope, 6),
+            )
+
+        snap = indicator_cache.get_or_compute(price_fingerprint(prices), "snapshot", (), snapshot)
         return asdict(snap)
 
+    @app.skill(tags=["indicators"])
+    def update_indicators(
+        asset: str,
+        prices: list[float],
+        seed: bool = False,
+    ) -> Optional[dict[str, Any]]:
+        """
+        O(1)-per-bar indicator update from the asset's streaming state.
+
+        `seed=True` rebuilds the state from a daily-close history; otherwise
+        `prices` are treated as new daily closes, and an empty list just
+        reads the current indicators. Indicators cover the last 252 bars,
+        like `compute_indicators` on the engine's history window. Returns
+        None if the asset has not been seeded yet.
+        """
+        if seed:
+            indicator_states[asset] = IndicatorState.from_prices(prices)
+        elif asset not in indicator_states:
+            return None
+        else:
+            indicator_states[asset].extend(prices)
+        return asdict(indicator_states[asset].snapshot())
+
     @app.skill(tags=["backtest"])
     def run_backtest(
         strategy_id: StrategyId,
@@ -91,42 +117,19 @@ def register(app: AgentFieldLiteApp) -> None:
         constraints: dict[str, Any],
     ) -> dict[str, Any]:
         c = StrategyConstraints(**constraints)
-
-        if strategy_id == "fire":
-            base = momentum_backtest(prices).model_dump()
-        elif strategy_id == "water":
-            base = conservative_backtest(prices).model_dump()
-        elif strategy_id == "grass":
-            base = adaptive_backtest(prices).model_dump()
-        else:
+        if strategy_id not in _BACKTEST_STRATEGIES:
             raise ValueError(f"unknown strategy_id: {strategy_id}")
 
-        # Deterministic "constraint effects" model (hackathon practical):
-        # - position cap linearly scales both returns and drawdowns
-        cap = float(c.position_cap_pct)
-        base["total_return"] = round(float(base["total_return"]) * cap, 4)
-        base["max_drawdown"] = round(float(base["max_drawdown"]) * cap, 4)
-
-        # - trade frequency cap reduces trades and slightly smooths volatility
-        trades = int(base.get("trades", 0))
-        freq_cap = int(c.max_trade_freq_per_day)
-        if freq_cap <= 0:
-            base["trades"] = 0
-            base["total_return"] = round(float(base["total_return"]) * 0.5, 4)
-        else:
-            # heuristic: treat "per day" cap as a throttle factor
-            throttle = min(1.0, max(0.1, freq_cap / 5.0))
-            base["trades"] = int(trades * throttle)
-            base["volatility"] = round(float(base["volatility"]) * (0.9 + 0.1 * throttle), 4)
-
-        # - stop loss policy reduces drawdown, also reduces return
+        # Constraints are enforced inside the simulation, bar by bar (daily bars)
         sl: StopLossPolicy = c.stop_loss_policy
-        if sl.type != "none" and sl.pct is not None:
-            pct = float(sl.pct)
-            dd_abs = abs(float(base["max_drawdown"]))
-            dd_capped = -min(dd_abs, pct)
-            base["max_drawdown"] = round(float(dd_capped), 4)
-            base["total_return"] = round(float(base["total_return"]) * 0.92, 4)
+        base = constrained_backtest(
+            prices,
+            _BACKTEST_STRATEGIES[strategy_id],
+            position_cap=float(c.position_cap_pct),
+            stop_loss=sl.type,
+            stop_pct=sl.pct,
+            max_trades_per_day=int(c.max_trade_freq_per_day),
+        ).model_dump()
 
         return {"strategy_id": strategy_id, "constraints": c.model_dump(), "metrics": base}
 
@@ -0,0 +1,110 @@
+"""
+MagiStock — Indicator Cache (Skill utility)
+
+Content-addressed LRU cache for indicator outputs. Entries are keyed by
+(fingerprint of the price buffer, indicator name, parameters), so every
+strategy that asks for the same indicator on the same prices shares one
+computation. Pure functions in, identical results out — the cache never
+changes a value, only whether it is recomputed.
+"""
+
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+def price_fingerprint(prices) -> str:
+    """Stable digest of a price buffer (values, dtype and shape)."""
+    arr = np.ascontiguousarray(prices, dtype=float)
+    h = blake2b(digest_size=16)
+    h.update(str(arr.shape).encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 64
+
+
+def _freeze(value: Any) -> Any:
+    """Cached arrays are shared between callers, so make them read-only."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    return value
+
+
+class IndicatorCache:
+    """Thread-safe LRU cache with a byte budget and hit/miss counters."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        fingerprint: str,
+        name: str,
+        params: tuple,
+        compute: Callable[[], Any],
+    ) -> Any:
+        key = (fingerprint, name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = _freeze(compute())
+        size = _nbytes(value)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Process-wide cache shared by the strategies and the risk governor skills.
+indicator_cache = IndicatorCache()
@@ -5,150 +5,601 @@ Pure computation functions. Same input → same output. Every time.
 These are used inside Skills, never in Reasoners.
 """
 
+import math
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Optional
 
 
-def sma(prices: list[float], window: int) -> list[Optional[float]]:
-    """Simple Moving Average."""
-    result = [None] * len(prices)
-    arr = np.array(prices)
-    for i in range(window - 1, len(arr)):
-        result[i] = float(np.mean(arr[i - window + 1 : i + 1]))
-    return result
+# ─── Bar Frequency ───────────────────────────────────────────────────────────
 
+# Bars per session by bar size: one 6.5-hour US equity session, 9:30–16:00.
+# Hourly bars start on the half hour, so the last one covers only 15:30–16:00.
+BARS_PER_DAY = {
+    "1m": 390,
+    "5m": 78,
+    "15m": 26,
+    "30m": 13,
+    "1h": 7,
+    "1d": 1,
+}
 
-def ema(prices: list[float], window: int) -> list[Optional[float]]:
-    """Exponential Moving Average."""
-    result = [None] * len(prices)
-    arr = np.array(prices, dtype=float)
-    multiplier = 2.0 / (window + 1)
+# Bars per year by bar size: 252 sessions.
+BARS_PER_YEAR = {freq: 252 * bars for freq, bars in BARS_PER_DAY.items()}
 
-    # Start with SMA for first value
-    if len(arr) < window:
-        return result
 
-    result[window - 1] = float(np.mean(arr[:window]))
-    for i in range(window, len(arr)):
-        result[i] = (arr[i] - result[i - 1]) * multiplier + result[i - 1]
+def session_bars(bar_freq: str = "1d") -> int:
+    """Bars in one trading session for a bar frequency such as "5m"."""
+    try:
+        return BARS_PER_DAY[bar_freq]
+    except KeyError:
+        raise ValueError(f"Unknown bar frequency {bar_freq!r}; expected one of {list(BARS_PER_DAY)}") from None
 
-    return result
 
+def periods_per_year(bar_freq: str = "1d") -> float:
+    """Annualization factor (bars per year) for a bar frequency such as "5m"."""
+    return 252 * session_bars(bar_freq)
+
+
+# ─── Rolling-Window Kernel ───────────────────────────────────────────────────
+
+# Windows are evaluated in blocks of at least this many outputs so prefix sums
+# stay short. Blocks grow with the window so chunk overlap (window − 1 bars per
+# block) never more than doubles the working set, even for intraday windows
+# spanning thousands of bars.
+_ROLLING_BLOCK = 512
+
+
+def _blocked(values: np.ndarray, span: int, n_out: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """
+    Cut the last axis into overlapping chunks of `block + span - 1` bars, one
+    per `block` consecutive outputs, and shift each chunk by its own mean.
+
+    Returns (shifted chunks, chunk centers, block). Prefix sums taken inside a
+    chunk are short and centered, which keeps sum-of-squares formulas well
+    conditioned.
+    """
+    block = min(max(_ROLLING_BLOCK, span), n_out)
+    n_blocks = -(-n_out // block)
+    pad = n_blocks * block - n_out
+    if pad:
+        values = np.concatenate([values, np.repeat(values[..., -1:], pad, axis=-1)], axis=-1)
+
+    chunks = sliding_window_view(values, block + span - 1, axis=-1)[..., ::block, :]
+    center = chunks.mean(axis=-1, keepdims=True, dtype=np.float64).astype(values.dtype)
+    return chunks - center, center, block
+
+
+def _window_sums(x: np.ndarray, window: int, start: int, count: int) -> np.ndarray:
+    """Sums of x[..., start + j : start + j + window] for j in [0, count), accumulated in float64."""
+    c = np.concatenate([np.zeros(x.shape[:-1] + (1,)), np.cumsum(x, axis=-1, dtype=np.float64)], axis=-1)
+    return c[..., start + window : start + window + count] - c[..., start : start + count]
+
+
+def _unblock(values: np.ndarray, n_out: int) -> np.ndarray:
+    return values.reshape(values.shape[:-2] + (-1,))[..., :n_out]
+
+
+def _settle_variance(var: np.ndarray, d: np.ndarray, window: int) -> np.ndarray:
+    """Zero out window variances below the prefix-sum rounding error of their chunk."""
+    scale = (d * d).sum(axis=-1, keepdims=True, dtype=np.float64) / window
+    return np.where(var > 4 * d.shape[-1] * np.finfo(float).eps * scale, var, 0.0)
+
+
+def _rolling_moments(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population variance of every full window along the last axis.
+
+    O(n): windowed sums are differences of blocked prefix sums.
+    Output k covers values[..., k : k + window].
+    """
+    n_out = values.shape[-1] - window + 1
+    if window < 1 or n_out <= 0:
+        empty = np.empty(values.shape[:-1] + (0,))
+        return empty, empty.copy()
+
+    d, center, block = _blocked(values, window, n_out)
+    mean_d = _window_sums(d, window, 0, block) / window
+    mean_sq = _window_sums(d * d, window, 0, block) / window
+    var = _settle_variance(mean_sq - mean_d * mean_d, d, window)
+    return _unblock(mean_d + center, n_out), _unblock(var, n_out)
+
+
+def _rolling_autocorr(values: np.ndarray, window: int, lags: tuple[int, ...]) -> np.ndarray:
+    """
+    Rolling lag-k autocorrelation for several lags in one pass.
+
+    Output j of lag k correlates values[..., j : j + window] with
+    values[..., j - k : j - k + window]; it is NaN for j < k and for windows
+    with zero variance. Sums of x and x² are shared by every lag, only the
+    cross term x·x_lagged is accumulated per lag. Returns an array of shape
+    (len(lags), ..., n - window + 1).
+    """
+    n_out = values.shape[-1] - window + 1
+    if window < 1 or n_out <= 0:
+        return np.empty((len(lags),) + values.shape[:-1] + (0,))
+
+    max_lag = max(lags)
+    # Front-pad so every output has a (possibly padded) lagged window in its chunk
+    padded = np.concatenate([np.repeat(values[..., :1], max_lag, axis=-1), values], axis=-1)
+    d, _, block = _blocked(padded, window + max_lag, n_out)
+    span = d.shape[-1]
+
+    def moments(start):
+        s1 = _window_sums(d, window, start, block) / window
+        s2 = _window_sums(d * d, window, start, block) / window
+        return s1, _settle_variance(s2 - s1 * s1, d, window)
+
+    mean_x, var_x = moments(max_lag)
+    out = np.full((len(lags),) + values.shape[:-1] + (n_out,), np.nan)
+    for idx, lag in enumerate(lags):
+        mean_y, var_y = moments(max_lag - lag)
+        # Cross products d[t] * d[t - lag], aligned on t
+        cross = np.zeros_like(d)
+        cross[..., lag:] = d[..., lag:] * d[..., : span - lag]
+        cov = _window_sums(cross, window, max_lag, block) / window - mean_x * mean_y
+        denom = np.sqrt(var_x * var_y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = _unblock(np.where(denom > 0, cov / denom, np.nan), n_out)
+        corr[..., :lag] = np.nan
+        out[idx] = corr
+    return out
+
+
+def _rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    OLS slope of every full window along the last axis against 0..window-1.
+
+    slope = Σ (k − k̄)·y_k / Σ (k − k̄)², with Σ k·y and Σ y taken from blocked
+    prefix sums over each chunk's local bar index, so the cost is O(n) for
+    any window. Output k covers values[..., k : k + window].
+    """
+    n_out = values.shape[-1] - window + 1
+    if window < 2 or n_out <= 0:
+        return np.empty(values.shape[:-1] + (max(n_out, 0),)) * np.nan
+
+    d, _, block = _blocked(values, window, n_out)
+    # Local bar index, centered on the chunk like the values themselves
+    offset = (d.shape[-1] - 1) / 2
+    t = np.arange(d.shape[-1], dtype=np.float64) - offset
+    sum_y = _window_sums(d, window, 0, block)
+    sum_ty = _window_sums(t * d, window, 0, block)
+    # Window j spans t = j − offset … j − offset + window − 1, so
+    # Σ (k − k̄)·y = Σ t·y − (j − offset + k̄)·Σ y
+    sxy = sum_ty - (np.arange(block) - offset + (window - 1) / 2) * sum_y
+    sxx = window * (window * window - 1) / 12
+    return _unblock(sxy / sxx, n_out)
+
+
+# ─── Batch Indicators (assets × bars) ────────────────────────────────────────
+#
+# Each function takes a 2-D float array with one asset per row and returns
+# float64 arrays of the same shape, NaN where a value is undefined. Ragged
+# histories are expressed as NaN padding: a window that touches a NaN is NaN,
+# and recursive indicators (EMA, RSI) seed from each row's first valid bar.
+#
+# Precision policy: `dtype=np.float32` (COMPACT) stores prices, intermediates
+# and outputs in float32 to halve memory on universe-wide passes. Prefix sums,
+# variances, chunk centers, log returns and recursive-filter states are still
+# accumulated in float64. Against the float64 path, on price-like data:
+#   sma / ema / Bollinger middle       relative error ≤ 1e-6
+#   Bollinger width / volatility       relative error ≤ 1e-4
+#   RSI                                absolute error ≤ 0.01 points
+#   autocorrelation                    absolute error ≤ 1e-4
+#   MACD line                          absolute error ≤ 1e-6 × price level
+
+COMPACT = np.float32
+
+
+def _as_matrix(prices, dtype=np.float64) -> np.ndarray:
+    matrix = np.array(prices, dtype=dtype)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected a 2-D (assets × bars) array, got shape {matrix.shape}")
+    return matrix
+
+
+def _shift_rows(matrix: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """out[r, j] = matrix[r, j + offsets[r]], NaN where that falls outside the row."""
+    n = matrix.shape[1]
+    cols = np.arange(n)[None, :] + offsets[:, None]
+    inside = (cols >= 0) & (cols < n)
+    out = np.take_along_axis(matrix, np.clip(cols, 0, max(n - 1, 0)), axis=1)
+    out[~inside] = np.nan
+    return out
+
+
+def _first_valid(matrix: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(matrix)
+    first = np.argmax(valid, axis=1)
+    first[~valid.any(axis=1)] = matrix.shape[1]
+    return first
+
+
+def _fill_gaps(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Forward-fill NaNs along axis 1 (leading NaNs → 0); returns (filled, valid mask)."""
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[1])[None, :], 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.nan_to_num(np.take_along_axis(values, idx, axis=1)), valid
+
+
+def _complete_windows(valid: np.ndarray, window: int) -> np.ndarray:
+    counts = np.cumsum(np.concatenate([np.zeros((valid.shape[0], 1), dtype=int), valid], axis=1), axis=1)
+    return (counts[:, window:] - counts[:, :-window]) == window
+
+
+def _masked_rolling_moments(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """`_rolling_moments` along axis 1, NaN for any window containing a NaN."""
+    # Filling gaps (rather than zeroing) keeps the kernel's block centering tight
+    filled, valid = _fill_gaps(values)
+    mean, var = _rolling_moments(filled, window)
+    complete = _complete_windows(valid, window)
+    mean[~complete] = np.nan
+    var[~complete] = np.nan
+    return mean, var
+
+
+def _pad_front(values: np.ndarray, n: int, dtype=np.float64) -> np.ndarray:
+    out = np.full(values.shape[:-1] + (n,), np.nan, dtype=dtype)
+    if values.shape[-1]:
+        out[..., n - values.shape[-1] :] = values
+    return out
+
+
+# Largest growth d**-k a closed-form block may reach before rescaling.
+_FILTER_GROWTH = 1e100
+
+
+def _recursive_filter(x: np.ndarray, alpha: float, init) -> np.ndarray:
+    """
+    y[t] = y[t-1] + alpha * (x[t] - y[t-1]) along the last axis, with y[-1] = init.
+
+    Works on any leading shape. Instead of stepping bar by bar, each block of
+    the series is solved in closed form, y[k] = d^(k+1) * (s + alpha * Σ_j x[j] d^-(j+1))
+    with d = 1 - alpha and s the state entering the block; block length is
+    bounded so d^-k cannot overflow.
+    """
+    x = np.asarray(x)
+    if not np.issubdtype(x.dtype, np.floating):
+        x = x.astype(float)
+    decay = 1.0 - alpha
+    if decay == 0.0:
+        return x.copy()
+
+    n = x.shape[-1]
+    block = max(1, min(n, int(np.log(_FILTER_GROWTH) / -np.log(decay))))
+    powers = decay ** np.arange(1, block + 1)
+    inverse = 1.0 / powers
+
+    y = np.empty_like(x)
+    state = np.broadcast_to(np.asarray(init, dtype=float), x.shape[:-1])
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        k = stop - start
+        acc = np.cumsum(x[..., start:stop] * inverse[:k], axis=-1)
+        y[..., start:stop] = powers[:k] * (state[..., None] + alpha * acc)
+        state = y[..., stop - 1]
+    return y
+
+
+def batch_sma(prices, window: int, dtype=np.float64) -> np.ndarray:
+    """Simple Moving Average per row."""
+    matrix = _as_matrix(prices, dtype)
+    mean, _ = _masked_rolling_moments(matrix, window)
+    return _pad_front(mean, matrix.shape[1], dtype)
+
+
+def batch_ema(prices, window: int, dtype=np.float64) -> np.ndarray:
+    """Exponential Moving Average per row, seeded with the SMA of the first valid window."""
+    matrix = _as_matrix(prices, dtype)
+    n = matrix.shape[1]
+    out = np.full_like(matrix, np.nan)
+    if n < window:
+        return out
+
+    first = _first_valid(matrix)
+    aligned = _shift_rows(matrix, first)
+    seed = aligned[:, :window].mean(axis=1, dtype=np.float64)
+    out[:, window - 1] = seed
+    out[:, window:] = _recursive_filter(aligned[:, window:], 2.0 / (window + 1), seed)
+    return _shift_rows(out, -first)
+
+
+def batch_rsi(prices, window: int = 14, dtype=np.float64) -> np.ndarray:
+    """Wilder RSI (0-100) per row, seeded from each row's first valid bar."""
+    matrix = _as_matrix(prices, dtype)
+    n = matrix.shape[1]
+    out = np.full_like(matrix, np.nan)
+    if n < window + 1:
+        return out
+
+    first = _first_valid(matrix)
+    deltas = np.diff(_shift_rows(matrix, first), axis=1)
+    gains = np.maximum(deltas, 0.0)
+    losses = np.maximum(-deltas, 0.0)
+
+    avg_gain = np.empty_like(deltas[:, window - 1 :])
+    avg_loss = np.empty_like(avg_gain)
+    avg_gain[:, 0] = gains[:, :window].mean(axis=1, dtype=np.float64)
+    avg_loss[:, 0] = losses[:, :window].mean(axis=1, dtype=np.float64)
+    avg_gain[:, 1:] = _recursive_filter(gains[:, window:], 1.0 / window, avg_gain[:, 0])
+    avg_loss[:, 1:] = _recursive_filter(losses[:, window:], 1.0 / window, avg_loss[:, 0])
+
+    out[:, window:] = _rsi_from_averages(avg_gain, avg_loss)
+    return _shift_rows(out, -first)
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """RSI from Wilder's smoothed average gain and loss (100 when there is no loss)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, values)
+
+
+def batch_macd(
+    prices, fast: int = 12, slow: int = 26, signal: int = 9, dtype=np.float64
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    MACD per row: (macd_line, signal_line).
+
+    The signal EMA seeds from each row's first valid MACD value, which the
+    left-alignment in `batch_ema` handles without compacting the series.
+    """
+    macd_line = batch_ema(prices, fast, dtype) - batch_ema(prices, slow, dtype)
+    return macd_line, batch_ema(macd_line, signal, dtype)
+
+
+def batch_bollinger_bands(
+    prices, window: int = 20, num_std: float = 2.0, dtype=np.float64
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands per row: (upper, middle, lower)."""
+    matrix = _as_matrix(prices, dtype)
+    mean, var = _masked_rolling_moments(matrix, window)
+    band = num_std * np.sqrt(var)
+    n = matrix.shape[1]
+    return _pad_front(mean + band, n, dtype), _pad_front(mean, n, dtype), _pad_front(mean - band, n, dtype)
+
+
+def _log_returns(matrix: np.ndarray) -> np.ndarray:
+    # Log prices are differenced in float64; only the returns are stored compact
+    return np.diff(np.log(matrix, dtype=np.float64), axis=1).astype(matrix.dtype, copy=False)
+
+
+def batch_rolling_volatility(prices, window: int = 20, dtype=np.float64, bar_freq: str = "1d") -> np.ndarray:
+    """Rolling volatility of log returns per row, annualized for `bar_freq` bars."""
+    matrix = _as_matrix(prices, dtype)
+    _, var = _masked_rolling_moments(_log_returns(matrix), window)
+    return _pad_front(np.sqrt(var) * np.sqrt(periods_per_year(bar_freq)), matrix.shape[1], dtype)
+
+
+def batch_rolling_slope(prices, window: int = 30, dtype=np.float64) -> np.ndarray:
+    """Rolling OLS slope of price against bar index per row (price units per bar)."""
+    matrix = _as_matrix(prices, dtype)
+    filled, valid = _fill_gaps(matrix)
+    slope = _rolling_slope(filled, window)
+    if slope.shape[-1]:
+        slope[~_complete_windows(valid, window)] = np.nan
+    return _pad_front(slope, matrix.shape[1], dtype)
+
+
+def batch_autocorrelations(prices, window: int = 20, lags=(1,), dtype=np.float64) -> dict[int, np.ndarray]:
+    """
+    Rolling autocorrelation of log returns per row for several lags at once.
+
+    Returns {lag: array}. Requesting lags 1..5 costs little more than one lag:
+    the window sums of returns are shared and only the cross term is per lag.
+    """
+    matrix = _as_matrix(prices, dtype)
+    lags = tuple(int(lag) for lag in lags)
+    n = matrix.shape[1]
+    returns, valid = _fill_gaps(_log_returns(matrix))
+    corr = _rolling_autocorr(returns, window, lags)
+
+    out = {}
+    complete = _complete_windows(valid, window) if corr.shape[-1] else valid[:, :0]
+    for idx, lag in enumerate(lags):
+        values = corr[idx]
+        lagged_complete = np.zeros_like(complete)
+        lagged_complete[:, lag:] = complete[:, : complete.shape[1] - lag]
+        values[~(complete & lagged_complete)] = np.nan
+        out[lag] = _pad_front(values, n, dtype)
+    return out
+
+
+def batch_autocorrelation(prices, window: int = 20, lag: int = 1, dtype=np.float64) -> np.ndarray:
+    """Rolling lag-`lag` autocorrelation of log returns per row."""
+    return batch_autocorrelations(prices, window, (lag,), dtype)[lag]
+
+
+# ─── NumPy API (1-D) ─────────────────────────────────────────────────────────
+#
+# float64 arrays the same length as `prices`, NaN during warm-up. These are
+# what the strategies consume; the list functions below wrap them.
+
+def _row(batch_fn, prices, *args, dtype=np.float64, **kwargs):
+    out = batch_fn(np.asarray(prices, dtype=dtype)[None, :], *args, dtype=dtype, **kwargs)
+    if isinstance(out, tuple):
+        return tuple(values[0] for values in out)
+    return out[0]
 
-def rsi(prices: list[float], window: int = 14) -> list[Optional[float]]:
+
+def sma_array(prices, window: int, dtype=np.float64) -> np.ndarray:
+    """Simple Moving Average."""
+    return _row(batch_sma, prices, window, dtype=dtype)
+
+
+def ema_array(prices, window: int, dtype=np.float64) -> np.ndarray:
+    """Exponential Moving Average, seeded with the SMA of the first window."""
+    return _row(batch_ema, prices, window, dtype=dtype)
+
+
+def rsi_array(prices, window: int = 14, dtype=np.float64) -> np.ndarray:
     """Relative Strength Index (0-100)."""
-    result = [None] * len(prices)
-    if len(prices) < window + 1:
-        return result
+    return _row(batch_rsi, prices, window, dtype=dtype)
 
-    arr = np.array(prices, dtype=float)
-    deltas = np.diff(arr)
 
-    gains = np.where(deltas > 0, deltas, 0.0)
-    losses = np.where(deltas < 0, -deltas, 0.0)
+def bollinger_bands_array(
+    prices, window: int = 20, num_std: float = 2.0, dtype=np.float64
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands: (upper, middle, lower)."""
+    return _row(batch_bollinger_bands, prices, window, num_std, dtype=dtype)
 
-    avg_gain = float(np.mean(gains[:window]))
-    avg_loss = float(np.mean(losses[:window]))
 
-    for i in range(window, len(deltas)):
-        avg_gain = (avg_gain * (window - 1) + gains[i]) / window
-        avg_loss = (avg_loss * (window - 1) + losses[i]) / window
+def macd_array(
+    prices, fast: int = 12, slow: int = 26, signal: int = 9, dtype=np.float64
+) -> tuple[np.ndarray, np.ndarray]:
+    """MACD: (macd_line, signal_line). The signal EMA starts at the first valid MACD value."""
+    return _row(batch_macd, prices, fast, slow, signal, dtype=dtype)
 
-        if avg_loss == 0:
-            result[i + 1] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            result[i + 1] = 100.0 - (100.0 / (1.0 + rs))
 
-    # Fill the first RSI value
-    if avg_loss == 0:
-        result[window] = 100.0
-    else:
-        rs = float(np.mean(gains[:window])) / float(np.mean(losses[:window]))
-        result[window] = 100.0 - (100.0 / (1.0 + rs))
+def rolling_volatility_array(prices, window: int = 20, dtype=np.float64, bar_freq: str = "1d") -> np.ndarray:
+    """Rolling annualized volatility of returns (annualized for `bar_freq` bars)."""
+    return _row(batch_rolling_volatility, prices, window, dtype=dtype, bar_freq=bar_freq)
 
-    return result
 
+def rolling_slope_array(prices, window: int = 30, dtype=np.float64) -> np.ndarray:
+    """Rolling linear-regression slope of price per bar (trend strength)."""
+    return _row(batch_rolling_slope, prices, window, dtype=dtype)
 
-def bollinger_bands(
-    prices: list[float], window: int = 20, num_std: float = 2.0
-) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """Bollinger Bands: (upper, middle, lower)."""
-    middle = sma(prices, window)
-    upper = [None] * len(prices)
-    lower = [None] * len(prices)
-    arr = np.array(prices, dtype=float)
 
-    for i in range(window - 1, len(arr)):
-        std = float(np.std(arr[i - window + 1 : i + 1]))
-        if middle[i] is not None:
-            upper[i] = middle[i] + num_std * std
-            lower[i] = middle[i] - num_std * std
+def autocorrelation_array(prices, window: int = 20, lag: int = 1, dtype=np.float64) -> np.ndarray:
+    """Rolling autocorrelation of returns (used for regime detection)."""
+    return _row(batch_autocorrelation, prices, window, lag, dtype=dtype)
 
-    return upper, middle, lower
 
+def autocorrelations_array(
+    prices, window: int = 20, lags=(1, 2, 3, 4, 5), dtype=np.float64
+) -> dict[int, np.ndarray]:
+    """Rolling autocorrelation of returns for several lags in one pass: {lag: array}."""
+    out = batch_autocorrelations(np.asarray(prices, dtype=dtype)[None, :], window, lags, dtype)
+    return {lag: values[0] for lag, values in out.items()}
 
-def macd(
-    prices: list[float], fast: int = 12, slow: int = 26, signal: int = 9
-) -> tuple[list[Optional[float]], list[Optional[float]]]:
-    """MACD: (macd_line, signal_line)."""
-    fast_ema = ema(prices, fast)
-    slow_ema = ema(prices, slow)
 
-    macd_line = [None] * len(prices)
-    for i in range(len(prices)):
-        if fast_ema[i] is not None and slow_ema[i] is not None:
-            macd_line[i] = fast_ema[i] - slow_ema[i]
+# ─── Tail Evaluation ─────────────────────────────────────────────────────────
+#
+# Latest value only, computed from the minimum look-back instead of the full
+# series. None when the history is too short, like the list API. Recursive
+# indicators (EMA, RSI) restart from a seed `warmup` bars back; by default the
+# warm-up is long enough that the seed's residual weight is below
+# _TAIL_TOLERANCE, so results agree with the full-series value to ~1e-6.
+
+_TAIL_TOLERANCE = 1e-6
 
-    # Signal line is EMA of MACD values
-    valid_macd = [v for v in macd_line if v is not None]
-    if len(valid_macd) < signal:
-        return macd_line, [None] * len(prices)
 
-    signal_values = ema(valid_macd, signal)
-    signal_line = [None] * len(prices)
+def _warmup_bars(alpha: float, warmup: Optional[int]) -> int:
+    if warmup is not None:
+        return int(warmup)
+    if alpha >= 1.0:
+        return 0
+    return int(math.ceil(math.log(_TAIL_TOLERANCE) / math.log(1.0 - alpha)))
 
-    valid_idx = 0
-    for i in range(len(prices)):
-        if macd_line[i] is not None:
-            if valid_idx < len(signal_values):
-                signal_line[i] = signal_values[valid_idx]
-            valid_idx += 1
 
-    return macd_line, signal_line
+def _tail(prices, count: int) -> np.ndarray:
+    return np.asarray(prices[-count:] if count > 0 else prices[:0], dtype=float)
 
 
-def rolling_volatility(prices: list[float], window: int = 20) -> list[Optional[float]]:
-    """Rolling annualized volatility of returns."""
-    result = [None] * len(prices)
+def _last(values: np.ndarray) -> Optional[float]:
+    if values.size == 0 or math.isnan(values[-1]):
+        return None
+    return float(values[-1])
+
+
+def sma_tail(prices, window: int) -> Optional[float]:
+    """Latest Simple Moving Average value."""
+    if len(prices) < window:
+        return None
+    return float(np.mean(_tail(prices, window)))
+
+
+def ema_tail(prices, window: int, warmup: Optional[int] = None) -> Optional[float]:
+    """Latest EMA value, seeded `warmup` bars before the end."""
+    if len(prices) < window:
+        return None
+    return _last(ema_array(_tail(prices, window + _warmup_bars(2.0 / (window + 1), warmup)), window))
+
+
+def rsi_tail(prices, window: int = 14, warmup: Optional[int] = None) -> Optional[float]:
+    """Latest Wilder RSI value, seeded `warmup` bars before the end."""
     if len(prices) < window + 1:
-        return result
+        return None
+    return _last(rsi_array(_tail(prices, window + 1 + _warmup_bars(1.0 / window, warmup)), window))
 
-    arr = np.array(prices, dtype=float)
-    returns = np.diff(np.log(arr))
 
-    for i in range(window, len(returns) + 1):
-        vol = float(np.std(returns[i - window : i]) * np.sqrt(252))
-        result[i] = vol
+def bollinger_bands_tail(
+    prices, window: int = 20, num_std: float = 2.0
+) -> Optional[tuple[float, float, float]]:
+    """Latest Bollinger Bands: (upper, middle, lower)."""
+    if len(prices) < window:
+        return None
+    arr = _tail(prices, window)
+    middle = float(np.mean(arr))
+    band = num_std * float(np.std(arr))
+    return middle + band, middle, middle - band
 
-    return result
 
+def rolling_volatility_tail(prices, window: int = 20, bar_freq: str = "1d") -> Optional[float]:
+    """Latest rolling annualized volatility of returns."""
+    if len(prices) < window + 1:
+        return None
+    returns = np.diff(np.log(_tail(prices, window + 1)))
+    return float(np.std(returns) * np.sqrt(periods_per_year(bar_freq)))
 
-def autocorrelation(prices: list[float], window: int = 20, lag: int = 1) -> list[Optional[float]]:
-    """Rolling autocorrelation of returns (used for regime detection)."""
-    result = [None] * len(prices)
+
+def autocorrelation_tail(prices, window: int = 20, lag: int = 1) -> Optional[float]:
+    """Latest rolling autocorrelation of returns."""
     if len(prices) < window + lag + 1:
-        return result
+        return None
+    returns = np.diff(np.log(_tail(prices, window + lag + 1)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = float(np.corrcoef(returns[lag:], returns[:-lag])[0, 1])
+    return None if math.isnan(corr) else corr
+
+
+# ─── List API ────────────────────────────────────────────────────────────────
+#
+# Original interface: Python lists with None during warm-up.
+
+def _to_list(values: np.ndarray) -> list[Optional[float]]:
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+def sma(prices: list[float], window: int) -> list[Optional[float]]:
+    """Simple Moving Average."""
+    return _to_list(sma_array(prices, window))
+
+
+def ema(prices: list[float], window: int) -> list[Optional[float]]:
+    """Exponential Moving Average."""
+    return _to_list(ema_array(prices, window))
+
+
+def rsi(prices: list[float], window: int = 14) -> list[Optional[float]]:
+    """Relative Strength Index (0-100)."""
+    return _to_list(rsi_array(prices, window))
+
+
+def bollinger_bands(
+    prices: list[float], window: int = 20, num_std: float = 2.0
+) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
+    """Bollinger Bands: (upper, middle, lower)."""
+    upper, middle, lower = bollinger_bands_array(prices, window, num_std)
+    return _to_list(upper), _to_list(middle), _to_list(lower)
+
 
-    arr = np.array(prices, dtype=float)
-    returns = np.diff(np.log(arr))
+def macd(
+    prices: list[float], fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[list[Optional[float]], list[Optional[float]]]:
+    """MACD: (macd_line, signal_line)."""
+    macd_line, signal_line = macd_array(prices, fast, slow, signal)
+    return _to_list(macd_line), _to_list(signal_line)
 
-    for i in range(window + lag, len(returns) + 1):
-        r = returns[i - window : i]
-        r_lagged = returns[i - window - lag : i - lag]
-        if len(r) == len(r_lagged) and len(r) > 0:
-            corr = float(np.corrcoef(r, r_lagged)[0, 1])
-            if not np.isnan(corr):
-                result[i] = corr
 
-    return result
+def rolling_volatility(prices: list[float], window: int = 20, bar_freq: str = "1d") -> list[Optional[float]]:
+    """Rolling annualized volatility of returns. `bar_freq`: "1m", "5m", "15m", "30m", "1h" or "1d"."""
+    return _to_list(rolling_volatility_array(prices, window, bar_freq=bar_freq))
+
+
+def autocorrelation(prices: list[float], window: int = 20, lag: int = 1) -> list[Optional[float]]:
+    """Rolling autocorrelation of returns (used for regime detection)."""
+    return _to_list(autocorrelation_array(prices, window, lag))
@@ -2,24 +2,77 @@
 MagiStock — Market Data Provider (Skill utility)
 
 Provides historical price data for backtesting.
-Falls back to synthetic data if yfinance is not available.
+Serves from the local price store when it holds fresh data, otherwise
+fetches from yfinance; falls back to synthetic data if yfinance is not available.
+Repeated and concurrent requests for the same (ticker, window) are answered
+from an in-process cache with one shared fetch.
 """
 
 import numpy as np
 from datetime import datetime, timedelta
+from typing import Optional
 
+from .fetch_cache import FetchCache
+from .price_store import PriceStore, price_store
 
-def fetch_market_data(ticker: str = "SPY", period_days: int = 252) -> list[float]:
-    """
-    Fetch historical daily closing prices.
 
-    Tries yfinance first, falls back to realistic synthetic data.
+# Process-wide cache in front of the store and provider; ttl, max_entries and
+# max_bytes can be reassigned to tune it.
+market_data_cache = FetchCache(ttl=300.0, max_entries=256, max_bytes=32 * 1024 * 1024)
+
+
+def fetch_market_data(
+    ticker: str = "SPY",
+    period_days: int = 252,
+    store: Optional[PriceStore] = None,
+) -> np.ndarray:
+    """
+    Fetch historical daily closing prices as a read-only float64 array.
+
+    Served from the local price store (a zero-copy memory-mapped slice) when
+    it holds at least `period_days` bars written within its `max_age`, or all
+    the history yfinance had; only missing or stale data goes to yfinance,
+    and the download is stored. Fewer than `period_days` bars are returned
+    only when the provider has no more history. If
+    yfinance fails, a stale stored series is preferred over realistic
+    synthetic data. Results are cached in `market_data_cache` for its `ttl`,
+    and concurrent calls for the same ticker and window share one fetch.
     This is a Skill utility — deterministic for the same inputs when using synthetic data.
     """
+    store = store or price_store
+    # Symbols are case-insensitive: one spelling for the cache key, store and synthetic seed
+    ticker = ticker.upper()
+    key = (str(store.root), ticker, int(period_days))
+    return market_data_cache.get_or_fetch(key, lambda: _load_market_data(ticker, int(period_days), store))
+
+
+def _load_market_data(ticker: str, period_days: int, store: PriceStore) -> np.ndarray:
+    """Store → yfinance → stale store → synthetic."""
+    prices = store.read(ticker, period_days)
+    if prices is not None:
+        return prices
+
+    # Refresh at least as much history as was requested before
+    entry = store.entry(ticker)
+    bars = max(period_days, entry.get("requested", entry["bars"]) if entry else 0)
     try:
-        return _fetch_from_yfinance(ticker, period_days)
+        fetched = _fetch_from_yfinance(ticker, bars)
     except Exception:
-        return _generate_synthetic_data(ticker, period_days)
+        prices = store.read(ticker, period_days, allow_stale=True)
+        if prices is not None:
+            return prices
+        prices = np.asarray(_generate_synthetic_data(ticker, period_days))
+        prices.flags.writeable = False
+        return prices
+
+    try:
+        # A short download is all the provider has for `bars`: keep serving it at that size
+        store.write(ticker, fetched, requested=bars)
+    except OSError:
+        pass  # a read-only or full disk only costs the cache
+    prices = np.asarray(fetched[-period_days:])
+    prices.flags.writeable = False
+    return prices
 
 
 def _fetch_from_yfinance(ticker: str, period_days: int) -> list[float]:
@@ -0,0 +1,184 @@
+"""
+MagiStock — Monte Carlo Robustness (Skill utility)
+
+Distribution of a strategy's backtest metrics across thousands of resampled
+price paths. Paths are generated as a 2-D (paths × bars) array — by moving-
+block bootstrap of the observed log returns, or by geometric Brownian motion
+fitted to them — and the strategy's signal rules run on all paths of a chunk
+at once through the batch indicators. Chunks are sized to a byte budget, so
+memory stays bounded however many paths are requested. Seeded runs are
+reproducible and do not depend on the chunk size.
+"""
+
+import sys
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .indicator_cache import IndicatorCache
+from .indicators import periods_per_year
+from .schemas import MonteCarloResult
+from .strategies import STRATEGIES, _Indicators
+
+
+# Rough number of bars-sized float64 arrays alive per path while a chunk runs
+# (path, indicators, signals, returns, equity).
+_ARRAYS_PER_PATH = 24
+
+
+# ─── Path Generators ─────────────────────────────────────────────────────────
+
+def _log_returns(prices) -> np.ndarray:
+    arr = np.asarray(prices, dtype=float)
+    if arr.ndim != 1 or len(arr) < 3:
+        raise ValueError("need a 1-D price history of at least 3 bars")
+    return np.diff(np.log(arr))
+
+
+def _to_paths(start: float, log_returns: np.ndarray) -> np.ndarray:
+    paths = np.empty(log_returns.shape[:-1] + (log_returns.shape[-1] + 1,))
+    paths[..., 0] = 0.0
+    np.cumsum(log_returns, axis=-1, out=paths[..., 1:])
+    return start * np.exp(paths)
+
+
+def bootstrap_paths(
+    prices: list[float],
+    n_paths: int,
+    block: int = 20,
+    length: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Moving-block bootstrap: each path strings together random `block`-bar
+    runs of the observed log returns (keeping their short-range dependence)
+    and starts at the first observed price. Returns (n_paths, length).
+    """
+    returns = _log_returns(prices)
+    rng = rng if rng is not None else np.random.default_rng()
+    length = length or len(returns) + 1
+    block = max(1, min(int(block), len(returns)))
+    n_blocks = -(-(length - 1) // block)
+
+    starts = rng.integers(0, len(returns) - block + 1, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, : length - 1]
+    return _to_paths(float(prices[0]), returns[idx])
+
+
+def gbm_paths(
+    prices: list[float],
+    n_paths: int,
+    length: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Geometric Brownian motion with the observed log-return drift and volatility."""
+    returns = _log_returns(prices)
+    rng = rng if rng is not None else np.random.default_rng()
+    length = length or len(returns) + 1
+    draws = rng.standard_normal((n_paths, length - 1))
+    return _to_paths(float(prices[0]), returns.mean() + returns.std() * draws)
+
+
+# ─── Path Metrics ────────────────────────────────────────────────────────────
+
+def _path_metrics(paths: np.ndarray, signals: np.ndarray, bar_freq: str = "1d") -> dict[str, np.ndarray]:
+    """
+    Per-path metrics of the all-in / all-out simulator, vectorized across paths.
+
+    The equity curve compounds the strategy's per-bar returns (held position
+    × price return), which is the simulator's curve up to rounding.
+    """
+    positions = signals.astype(bool)
+    positions[:, 0] = False  # the simulator is flat after bar 0
+    held = positions[:, :-1]
+    bar_returns = np.where(held, paths[:, 1:] / paths[:, :-1] - 1.0, 0.0)
+
+    equity = np.cumprod(1.0 + bar_returns, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    max_drawdown = np.minimum((equity / peak - 1.0).min(axis=1), 0.0)
+
+    periods = periods_per_year(bar_freq)
+    std = bar_returns.std(axis=1)
+    excess = bar_returns.mean(axis=1) - 0.04 / periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, excess / std * np.sqrt(periods), 0.0)
+
+    trades = np.count_nonzero(positions[:, 1:] & ~positions[:, :-1], axis=1)
+    return {
+        "total_return": equity[:, -1] - 1.0,
+        "max_drawdown": max_drawdown,
+        "volatility": std * np.sqrt(periods),
+        "sharpe_ratio": sharpe,
+        "trades": trades.astype(float),
+    }
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+def monte_carlo(
+    prices: list[float],
+    strategy: str = "momentum",
+    n_paths: int = 1000,
+    method: str = "bootstrap",
+    block: int = 20,
+    length: Optional[int] = None,
+    seed: Optional[int] = 0,
+    percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+    max_bytes: int = 64 * 1024 * 1024,
+    dtype=np.float64,
+    bar_freq: str = "1d",
+    **params,
+) -> MonteCarloResult:
+    """
+    Percentile table of Sharpe ratio, max drawdown, total return, volatility
+    and trade count for `strategy` across `n_paths` resampled paths.
+
+    method: "bootstrap" (block bootstrap, `block` bars per block) or "gbm".
+    length: bars per path (default: the history's length).
+    max_bytes: approximate working-memory budget; paths run in chunks that fit.
+    bar_freq: bar size of `prices` ("1d", "1h", "5m", ...) for annualization.
+    `params` go to the strategy (e.g. fast_window=20 for momentum).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+    if method not in ("bootstrap", "gbm"):
+        raise ValueError(f"Unknown method {method!r}; expected 'bootstrap' or 'gbm'")
+
+    build_signals, _ = STRATEGIES[strategy]
+    length = length or len(prices)
+    chunk = max(1, int(max_bytes) // (length * 8 * _ARRAYS_PER_PATH))
+    rng = np.random.default_rng(seed)
+
+    metrics: dict[str, list[np.ndarray]] = {}
+    for done in range(0, n_paths, chunk):
+        count = min(chunk, n_paths - done)
+        if method == "bootstrap":
+            paths = bootstrap_paths(prices, count, block, length, rng)
+        else:
+            paths = gbm_paths(prices, count, length, rng)
+
+        # Private cache per chunk: windows shared by the strategy's rules are
+        # computed once, and nothing outlives the chunk.
+        ind = _Indicators(paths, dtype, cache=IndicatorCache(max_bytes=sys.maxsize), bar_freq=bar_freq)
+        for name, values in _path_metrics(paths, build_signals(ind, **params), bar_freq).items():
+            metrics.setdefault(name, []).append(values)
+
+    table = {}
+    for name, chunks in metrics.items():
+        values = np.concatenate(chunks)
+        table[name] = {
+            _label(q): round(float(v), 4)
+            for q, v in zip(percentiles, np.percentile(values, percentiles))
+        }
+        table[name]["mean"] = round(float(values.mean()), 4)
+    return MonteCarloResult(
+        strategy=strategy,
+        method=method,
+        paths=n_paths,
+        bars=length,
+        percentiles=table,
+    )
+
+
+def _label(q: float) -> str:
+    return f"p{int(q)}" if float(q).is_integer() else f"p{q:g}"
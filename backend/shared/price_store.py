@@ -0,0 +1,152 @@
+"""
+MagiStock — Local Price Store (Skill utility)
+
+On-disk cache of daily closes: one float64 `.npy` file per ticker plus a
+small JSON index recording how many bars each file holds and when it was
+last refreshed. Files are opened memory-mapped, so a read is a zero-copy,
+read-only slice of the page cache rather than a download or a parse.
+Writes go to a temporary file and are swapped in with an atomic rename,
+so readers in other processes never see a half-written series, and index
+updates hold a file lock so concurrent writers do not drop each other's
+entries.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: index updates are only serialized in-process
+    fcntl = None
+
+
+_DEFAULT_ROOT = Path(__file__).resolve().parents[1] / "data" / "prices"
+
+
+class PriceStore:
+    """
+    Memory-mapped price histories under `root`.
+
+    A stored series is fresh for `max_age` seconds after it was written
+    (default: one day, the cadence of daily bars). Index and mappings are
+    reloaded when another process rewrites them.
+    """
+
+    def __init__(self, root: Union[str, Path] = _DEFAULT_ROOT, max_age: float = 24 * 3600):
+        self.root = Path(root)
+        self.max_age = float(max_age)
+        self._index: dict[str, dict] = {}
+        self._index_mtime: Optional[int] = None
+        self._maps: dict[str, tuple[float, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.npy"
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            mtime = self._index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._index, self._index_mtime = {}, None
+            return self._index
+        if mtime != self._index_mtime:
+            try:
+                self._index = json.loads(self._index_path.read_text())
+            except (OSError, ValueError):
+                self._index = {}
+            self._index_mtime = mtime
+        return self._index
+
+    def entry(self, ticker: str) -> Optional[dict]:
+        """Index entry for `ticker` ({"bars", "requested", "updated", "source"}), or None."""
+        with self._lock:
+            return self._load_index().get(ticker.upper())
+
+    def read(self, ticker: str, bars: int, allow_stale: bool = False) -> Optional[np.ndarray]:
+        """
+        The last `bars` closes of `ticker` as a read-only memory-mapped view,
+        or None if the store has fewer bars or (unless `allow_stale`) the
+        series is older than `max_age`. A series the provider returned short
+        is served whole to requests no larger than what was asked of it.
+        """
+        key = ticker.upper()
+        with self._lock:
+            entry = self._load_index().get(key)
+            if entry is None or bars > entry.get("requested", entry["bars"]):
+                return None
+            if not allow_stale and time.time() - entry["updated"] > self.max_age:
+                return None
+
+            cached = self._maps.get(key)
+            if cached is None or cached[0] != entry["updated"]:
+                try:
+                    series = np.load(self._path(key), mmap_mode="r")
+                except (OSError, ValueError):
+                    return None
+                cached = (entry["updated"], series)
+                self._maps[key] = cached
+        series = cached[1]
+        return series[max(len(series) - bars, 0) :]
+
+    def write(self, ticker: str, prices, source: str = "yfinance", requested: Optional[int] = None) -> None:
+        """
+        Replace the stored series for `ticker` and stamp it as fresh.
+
+        `requested` is the bar count asked of the source; when `prices` came
+        back shorter, reads up to that size are served instead of refetched.
+        """
+        key = ticker.upper()
+        arr = np.ascontiguousarray(prices, dtype=np.float64)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._index_lock():
+            self._replace(self._path(key), lambda f: np.save(f, arr))
+            self._index_mtime = None  # re-read: another process may have written since
+            index = dict(self._load_index())
+            index[key] = {
+                "bars": int(len(arr)),
+                "requested": max(int(requested or 0), int(len(arr))),
+                "updated": time.time(),
+                "source": source,
+            }
+            self._replace(self._index_path, lambda f: f.write(json.dumps(index, indent=1).encode()))
+            self._index, self._index_mtime = index, self._index_path.stat().st_mtime_ns
+            self._maps.pop(key, None)
+
+    @contextmanager
+    def _index_lock(self):
+        """Exclusive lock on the index across processes (a no-op without fcntl)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / ".index.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _replace(self, path: Path, dump) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                dump(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+# Process-wide store used by `fetch_market_data`; MAGISTOCK_PRICE_STORE moves it.
+price_store = PriceStore(os.getenv("MAGISTOCK_PRICE_STORE", _DEFAULT_ROOT))
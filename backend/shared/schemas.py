@@ -6,7 +6,7 @@ not free-form text. Your code consumes it directly.
 """
 
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import Literal, Union
 
 
 # ─── User Persona ────────────────────────────────────────────────────────────
@@ -37,6 +37,33 @@ class BacktestResult(BaseModel):
     avg_trade_return: float = Field(description="Average return per trade")
 
 
+class WalkForwardWindow(BaseModel):
+    """In-sample and out-of-sample results for one walk-forward window."""
+    train_start: int = Field(description="First bar of the training window")
+    test_start: int = Field(description="First bar of the test window (end of training)")
+    test_end: int = Field(description="One past the last bar of the test window")
+    train: BacktestResult
+    test: BacktestResult
+
+
+class MonteCarloResult(BaseModel):
+    """Distribution of backtest metrics across resampled price paths."""
+    strategy: str
+    method: Literal["bootstrap", "gbm"] = Field(description="Path generator")
+    paths: int = Field(description="Number of simulated paths")
+    bars: int = Field(description="Bars per path")
+    percentiles: dict[str, dict[str, float]] = Field(
+        description="Metric → {'p5': ..., 'p50': ..., 'mean': ...} across paths"
+    )
+
+
+class SweepResult(BaseModel):
+    """One ranked parameter combination from a strategy parameter sweep."""
+    rank: int = Field(description="1-based rank by the sweep's ranking metric")
+    params: dict[str, Union[int, float]] = Field(description="Strategy parameters used for this run")
+    result: BacktestResult
+
+
 # ─── Strategy Critique ───────────────────────────────────────────────────────
 
 class StrategyCritique(BaseModel):
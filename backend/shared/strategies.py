@@ -5,87 +5,346 @@ Pure computation. Same input → same output. Every time.
 These functions are used inside Skills — no AI, no surprises.
 """
 
+from functools import cached_property
+from typing import Optional, Union
+
 import numpy as np
-from .indicators import sma, rsi, bollinger_bands, ema, rolling_volatility, autocorrelation
-from .schemas import BacktestResult
+from .indicators import (
+    autocorrelation_array,
+    batch_autocorrelation,
+    batch_bollinger_bands,
+    batch_rolling_slope,
+    batch_rolling_volatility,
+    batch_rsi,
+    batch_sma,
+    bollinger_bands_array,
+    periods_per_year,
+    rolling_slope_array,
+    rolling_volatility_array,
+    rsi_array,
+    session_bars,
+    sma_array,
+)
+from .indicator_cache import IndicatorCache, indicator_cache, price_fingerprint
+from .schemas import BacktestResult, WalkForwardWindow
+
+
+# ─── Shared Indicators ───────────────────────────────────────────────────────
+
+class _Indicators:
+    """
+    Indicator arrays for one price series, served from the shared cache.
+
+    Every backtest on the same prices (and any other consumer of the cache)
+    reuses the same SMA / RSI / Bollinger computations. `dtype=np.float32`
+    opts into the compact precision policy of `shared.indicators`; `cache`
+    swaps in a private cache (the parameter sweep uses one); `bar_freq` is
+    the bar size ("1d", "1h", "5m", ...) used to annualize volatility. A 2-D
+    (paths × bars) price array is served by the batch indicators instead,
+    and every signal builder below works unchanged on it.
+    """
 
+    def __init__(
+        self,
+        prices,
+        dtype=np.float64,
+        cache: IndicatorCache = indicator_cache,
+        bar_freq: str = "1d",
+    ):
+        self.dtype = np.dtype(dtype)
+        self.prices = np.asarray(prices, dtype=self.dtype)
+        self.key = price_fingerprint(self.prices)
+        self.cache = cache
+        self.bar_freq = bar_freq
+
+    def _get(self, name, fn, batch_fn, *params, **options):
+        compute = batch_fn if self.prices.ndim == 2 else fn
+        return self.cache.get_or_compute(
+            self.key,
+            name,
+            params + tuple(options.items()) + (self.dtype.name,),
+            lambda: compute(self.prices, *params, dtype=self.dtype, **options),
+        )
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._get("sma", sma_array, batch_sma, window)
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        return self._get("rsi", rsi_array, batch_rsi, window)
+
+    def bollinger_bands(self, window: int = 20, num_std: float = 2.0):
+        return self._get("bollinger_bands", bollinger_bands_array, batch_bollinger_bands, window, float(num_std))
+
+    def rolling_volatility(self, window: int = 20) -> np.ndarray:
+        return self._get(
+            "rolling_volatility", rolling_volatility_array, batch_rolling_volatility, window, bar_freq=self.bar_freq,
+        )
+
+    def autocorrelation(self, window: int = 20, lag: int = 1) -> np.ndarray:
+        return self._get("autocorrelation", autocorrelation_array, batch_autocorrelation, window, lag)
+
+    def rolling_slope(self, window: int = 30) -> np.ndarray:
+        return self._get("rolling_slope", rolling_slope_array, batch_rolling_slope, window)
+
+    def sma_trend(self, fast_window: int, slow_window: int) -> np.ndarray:
+        """
+        sign(fast SMA − slow SMA) per bar: 1, 0 or -1, NaN until both are ready.
+
+        The rolling kernel's window sums round differently from a direct mean,
+        so SMAs that tie exactly (routine on cent-rounded closes) can come out
+        ±1e-14 apart and flip a crossover. Bars within tolerance of a tie are
+        decided again from np.mean over both windows, as a per-bar loop would,
+        a bounded batch of bars at a time (flat data is a near-tie everywhere).
+        """
+        fast = np.asarray(self.sma(fast_window), dtype=np.float64)
+        slow = np.asarray(self.sma(slow_window), dtype=np.float64)
+        diff = fast - slow
+        trend = np.sign(diff)
+        with np.errstate(invalid="ignore"):
+            near = np.abs(diff) <= _TIE_TOLERANCE * np.maximum(np.abs(fast), np.abs(slow))
+        if near.any():
+            at = np.nonzero(near)
+            prices = np.asarray(self.prices, dtype=np.float64)
+            batch = max(_TIE_BATCH_ELEMENTS // max(fast_window, slow_window), 1)
+            for lo in range(0, len(at[0]), batch):
+                part = tuple(i[lo : lo + batch] for i in at)
+                exact = _window_means(prices, part, fast_window) - _window_means(prices, part, slow_window)
+                trend[part] = np.sign(exact)
+        return trend
+
+    def signals(self, state: np.ndarray) -> np.ndarray:
+        """Resolve a rule state (_HOLD where no rule fires) into 0 / 1 signals."""
+        return _fill_holds(state)
+
+
+# Relative gap between two SMAs below which the crossover is re-decided
+# exactly; far above the kernel's rounding error, even for float32.
+_TIE_TOLERANCE = 1e-5
+
+# Window elements gathered per batch of tie re-checks (8 MB of float64)
+_TIE_BATCH_ELEMENTS = 1 << 20
+
+
+def _window_means(prices: np.ndarray, at: tuple, window: int) -> np.ndarray:
+    """np.mean of the `window` bars ending at each index `at` (last axis), bit-identical to a 1-D slice."""
+    index = tuple(i[:, None] for i in at)
+    return prices[index[:-1] + (index[-1] + np.arange(1 - window, 1),)].mean(axis=-1)
+
+
+# ─── Signal Engine ───────────────────────────────────────────────────────────
+#
+# Strategy rules are evaluated as whole-array buy / sell masks. Bars where no
+# rule fires are marked _HOLD and resolved with a forward-fill, which is the
+# array form of `signals[i] = signals[i - 1]`. The rule functions return
+# that state; `_Indicators.signals` does the fill, so a chunked run can seed
+# it with the signal carried over from the previous chunk.
+
+_HOLD = -1
+
+
+def _fill_holds(state: np.ndarray) -> np.ndarray:
+    """Replace _HOLD entries with the last explicit state (0 if none yet), along the last axis."""
+    n = state.shape[-1]
+    last = np.where(state != _HOLD, np.arange(1, n + 1), 0)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    padded = np.concatenate((np.zeros(state.shape[:-1] + (1,), dtype=np.int8), state.astype(np.int8)), axis=-1)
+    return np.take_along_axis(padded, last, axis=-1)
+
+
+def _rule_state(
+    buy: np.ndarray,
+    sell: np.ndarray,
+    flat: np.ndarray,
+    start: int,
+) -> np.ndarray:
+    """
+    State from rule masks: `buy` wins over `sell`, neither is _HOLD, and
+    `flat` bars (indicators not ready) or bars before `start` are 0.
+    """
+    state = np.full(buy.shape, _HOLD, dtype=np.int8)
+    state[sell] = 0
+    state[buy] = 1
+    state[flat] = 0
+    state[..., :start] = 0
+    return state
 
-# ─── Portfolio Simulator ─────────────────────────────────────────────────────
 
-def _simulate_portfolio(
-    prices: list[float],
-    signals: list[int],
-    initial_capital: float = 10000.0,
-) -> BacktestResult:
+def _momentum_state(sma_trend, rsi_values, start: int) -> np.ndarray:
+    """Golden cross + RSI > 50 buys; death cross or RSI < 40 sells."""
+    ready = ~(np.isnan(sma_trend) | np.isnan(rsi_values))
+    buy = (sma_trend > 0) & (rsi_values > 50)
+    sell = (sma_trend < 0) | (rsi_values < 40)
+    return _rule_state(buy, sell, ~ready, start)
+
+
+def _band_rules(prices, upper, lower, rsi_values, buy_rsi: float, sell_rsi: float):
+    """(buy, sell) masks for Bollinger mean reversion with an RSI filter."""
+    # Prices are compared in the band dtype, like a scalar `price <= band` would be
+    px = np.asarray(prices, dtype=np.result_type(lower.dtype, np.float32))
+    buy = (px <= lower * 1.02) & (rsi_values < buy_rsi)
+    sell = (px >= upper * 0.98) | (rsi_values > sell_rsi)
+    return buy, sell
+
+
+def _conservative_state(prices, upper, lower, rsi_values, start: int) -> np.ndarray:
+    """Oversold near the lower band buys; overbought near the upper band sells."""
+    ready = ~(np.isnan(lower) | np.isnan(upper) | np.isnan(rsi_values))
+    buy, sell = _band_rules(prices, upper, lower, rsi_values, 35, 70)
+    return _rule_state(buy, sell, ~ready, start)
+
+
+def _adaptive_state(
+    prices, vol, autocorr, sma_trend, upper, lower, rsi_values, start: int,
+) -> np.ndarray:
+    """High vol → cash; trending → SMA crossover; otherwise band reversion."""
+    sma_ready = ~np.isnan(sma_trend)
+    bb_ready = ~(np.isnan(lower) | np.isnan(upper) | np.isnan(rsi_values))
+
+    momentum = np.where(sma_trend > 0, 1, 0).astype(np.int8)
+    momentum[~sma_ready] = _HOLD
+
+    buy, sell = _band_rules(prices, upper, lower, rsi_values, 40, 65)
+    reversion = np.full(buy.shape, _HOLD, dtype=np.int8)
+    reversion[sell & bb_ready] = 0
+    reversion[buy & bb_ready] = 1
+
+    state = np.where(autocorr > 0.1, momentum, reversion)
+    state[(vol > 0.30) | np.isnan(vol)] = 0
+    state[..., :start] = 0
+    return state
+
+
+# ─── Portfolio Simulator ─────────────────────────────────────────────────────
+#
+# Array formulation of the all-in / all-out simulator: positions come from
+# signal transitions, trades from the transition indices, and the equity
+# curve from per-trade share counts. The only Python loop runs once per trade
+# (to chain capital from one trade into the next), never once per bar, and it
+# uses the same float operations as a bar-by-bar loop so metrics are identical.
+
+def _positions(signals, n: int) -> np.ndarray:
     """
-    Simulate a portfolio based on trading signals.
+    Position held after each bar (1 = long, 0 = cash).
 
-    signals: list of int where 1 = buy/hold, 0 = cash, -1 = sell/short
-    Returns BacktestResult with all performance metrics.
+    A signal of 1 buys / holds, <= 0 sells / stays in cash, anything else
+    keeps the previous position. Bar 0 is always flat; missing signals are 0.
     """
+    sig = np.zeros(n)
+    m = min(n, len(signals))
+    sig[:m] = np.asarray(signals[:m], dtype=float)
+    state = np.where(sig == 1, 1, np.where(sig <= 0, 0, _HOLD)).astype(np.int8)
+    state[:1] = 0
+    return _fill_holds(state)
+
+
+def _trade_indices(positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(entry bars, exit bars). An open final trade has no exit bar."""
+    step = np.diff(positions.astype(np.int8))
+    return np.flatnonzero(step == 1) + 1, np.flatnonzero(step == -1) + 1
+
+
+def _equity_curve(
+    prices: np.ndarray,
+    positions: np.ndarray,
+    initial_capital: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Portfolio value per bar and per-trade returns (open trades closed at the last bar)."""
+    n = len(prices)
+    if n == 0:
+        return np.array([initial_capital]), np.array([])
+
+    entries, exits = _trade_indices(positions)
+    entry_prices = prices[entries]
+    exit_prices = np.append(prices[exits], prices[-1]) if len(exits) < len(entries) else prices[exits]
+
+    # Chain capital through the trades: shares bought at entry, cash at exit
+    shares = []
+    cash_levels = [initial_capital]
     capital = initial_capital
-    position = 0.0  # Number of shares held
-    trades = 0
-    trade_returns = []
-    entry_price = 0.0
-    portfolio_values = [initial_capital]
-
-    for i in range(1, len(prices)):
-        signal = signals[i] if i < len(signals) else 0
-
-        if signal == 1 and position == 0:
-            # Buy
-            position = capital / prices[i]
-            entry_price = prices[i]
-            capital = 0.0
-            trades += 1
-        elif signal <= 0 and position > 0:
-            # Sell
-            capital = position * prices[i]
-            trade_return = (prices[i] - entry_price) / entry_price
-            trade_returns.append(trade_return)
-            position = 0.0
-
-        # Track portfolio value
-        if position > 0:
-            portfolio_values.append(position * prices[i])
-        else:
-            portfolio_values.append(capital)
-
-    # Close any open position
-    if position > 0:
-        capital = position * prices[-1]
-        trade_return = (prices[-1] - entry_price) / entry_price
-        trade_returns.append(trade_return)
-        portfolio_values[-1] = capital
-
-    # Calculate metrics
-    portfolio_arr = np.array(portfolio_values)
-    daily_returns = np.diff(portfolio_arr) / portfolio_arr[:-1]
+    for entry_price, exit_price in zip(entry_prices.tolist(), exit_prices.tolist()):
+        held = capital / entry_price
+        shares.append(held)
+        capital = held * exit_price
+        cash_levels.append(capital)
+
+    entry_count = np.zeros(n, dtype=np.int64)
+    exit_count = np.zeros(n, dtype=np.int64)
+    entry_count[entries] = 1
+    exit_count[exits] = 1
+    np.cumsum(entry_count, out=entry_count)
+    np.cumsum(exit_count, out=exit_count)
+
+    cash = np.asarray(cash_levels)[exit_count]
+    if shares:
+        held = np.asarray(shares)[np.maximum(entry_count - 1, 0)]
+        values = np.where(positions == 1, held * prices, cash)
+    else:
+        values = cash
+
+    trade_returns = (exit_prices - entry_prices) / entry_prices
+    return values, trade_returns
+
+
+def _summarize(
+    values: np.ndarray,
+    trade_returns: np.ndarray,
+    trades: int,
+    initial_capital: float,
+    bar_freq: str = "1d",
+) -> BacktestResult:
+    """Performance metrics of an equity curve and its trades, annualized for `bar_freq` bars."""
+    periods = periods_per_year(bar_freq)
+    daily_returns = np.diff(values) / values[:-1]
     daily_returns = daily_returns[~np.isnan(daily_returns)]
 
-    total_return = (portfolio_values[-1] - initial_capital) / initial_capital
+    total_return = (float(values[-1]) - initial_capital) / initial_capital
 
     # Max drawdown
-    peak = np.maximum.accumulate(portfolio_arr)
-    drawdowns = (portfolio_arr - peak) / peak
+    peak = np.maximum.accumulate(values)
+    drawdowns = (values - peak) / peak
     max_drawdown = float(np.min(drawdowns)) if len(drawdowns) > 0 else 0.0
 
     # Annualized volatility
-    volatility = float(np.std(daily_returns) * np.sqrt(252)) if len(daily_returns) > 0 else 0.0
+    volatility = float(np.std(daily_returns) * np.sqrt(periods)) if len(daily_returns) > 0 else 0.0
 
     # Sharpe ratio (assuming risk-free rate of 4%)
-    risk_free_daily = 0.04 / 252
+    risk_free_daily = 0.04 / periods
     excess_returns = daily_returns - risk_free_daily
-    sharpe = float(np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)) if np.std(excess_returns) > 0 else 0.0
+    excess_std = np.std(excess_returns) if len(excess_returns) else 0.0
+    # Flat equity (no trades) has a Sharpe of 0; the std of its constant excess
+    # series is only the rounding noise of subtracting the risk-free rate
+    sharpe = float(np.mean(excess_returns) / excess_std * np.sqrt(periods)) if volatility > 0 else 0.0
+
+    return _backtest_result(total_return, max_drawdown, volatility, sharpe, trades, trade_returns)
 
+
+def _backtest_result(
+    total_return: float,
+    max_drawdown: float,
+    volatility: float,
+    sharpe: float,
+    trades: int,
+    trade_returns: np.ndarray,
+) -> BacktestResult:
+    """Round the headline metrics and add the per-trade statistics."""
     # Win rate
-    winning = [r for r in trade_returns if r > 0]
-    win_rate = len(winning) / len(trade_returns) if trade_returns else 0.0
+    win_rate = int(np.count_nonzero(trade_returns > 0)) / len(trade_returns) if len(trade_returns) else 0.0
 
     # Average trade return
-    avg_trade_return = float(np.mean(trade_returns)) if trade_returns else 0.0
+    avg_trade_return = float(np.mean(trade_returns)) if len(trade_returns) else 0.0
 
+    return _rounded_result(total_return, max_drawdown, volatility, sharpe, trades, win_rate, avg_trade_return)
+
+
+def _rounded_result(
+    total_return: float,
+    max_drawdown: float,
+    volatility: float,
+    sharpe: float,
+    trades: int,
+    win_rate: float,
+    avg_trade_return: float,
+) -> BacktestResult:
     return BacktestResult(
         total_return=round(total_return, 4),
         max_drawdown=round(max_drawdown, 4),
@@ -97,6 +356,86 @@ def _simulate_portfolio(
     )
 
 
+# Trade ledger row: entry bar, exit bar (the last bar for a trade still open)
+# and the trade's return
+TRADE_DTYPE = np.dtype([("entry", np.int32), ("exit", np.int32), ("return", np.float64)])
+
+
+class BacktestDetails:
+    """
+    Opt-in backtest output: the summary plus the series behind it.
+
+    Only prices and positions are kept; the equity curve, trade ledger and
+    summary are built on first access, so asking for details costs nothing
+    until they are used. All arrays are read-only.
+    """
+
+    def __init__(
+        self,
+        prices: np.ndarray,
+        positions: np.ndarray,
+        initial_capital: float = 10000.0,
+        bar_freq: str = "1d",
+    ):
+        self._prices = prices
+        self.positions = positions  # int8, 1 = long after the bar's close
+        self.positions.flags.writeable = False
+        self.initial_capital = initial_capital
+        self.bar_freq = bar_freq
+
+    @cached_property
+    def _curve(self) -> tuple[np.ndarray, np.ndarray]:
+        values, trade_returns = _equity_curve(self._prices, self.positions, self.initial_capital)
+        values.flags.writeable = False
+        return values, trade_returns
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Portfolio value per bar (float64)."""
+        return self._curve[0]
+
+    @cached_property
+    def trades(self) -> np.ndarray:
+        """Trade ledger as a TRADE_DTYPE structured array."""
+        entries, exits = _trade_indices(self.positions)
+        ledger = np.empty(len(entries), dtype=TRADE_DTYPE)
+        ledger["entry"] = entries
+        ledger["exit"][: len(exits)] = exits
+        ledger["exit"][len(exits):] = len(self._prices) - 1
+        ledger["return"] = self._curve[1]
+        ledger.flags.writeable = False
+        return ledger
+
+    @cached_property
+    def result(self) -> BacktestResult:
+        values, trade_returns = self._curve
+        return _summarize(values, trade_returns, len(trade_returns), self.initial_capital, self.bar_freq)
+
+
+def _simulate_portfolio(
+    prices: list[float],
+    signals: list[int],
+    initial_capital: float = 10000.0,
+    details: bool = False,
+    bar_freq: str = "1d",
+) -> Union[BacktestResult, BacktestDetails]:
+    """
+    Simulate a portfolio based on trading signals.
+
+    signals: list of int where 1 = buy/hold, 0 = cash, -1 = sell/short
+    Returns BacktestResult with all performance metrics, or BacktestDetails
+    (summary plus equity curve, positions and trade ledger) if `details`.
+    Volatility and Sharpe are annualized for `bar_freq` bars ("1d", "1h",
+    "5m", "1m", ...).
+    """
+    arr = np.asarray(prices, dtype=float)
+    positions = _positions(signals, len(arr))
+    if details:
+        return BacktestDetails(arr, positions, initial_capital, bar_freq)
+    values, trade_returns = _equity_curve(arr, positions, initial_capital)
+    return _summarize(values, trade_returns, len(trade_returns), initial_capital, bar_freq)
+
+
 # ─── Momentum Strategy (Fire Agent) ─────────────────────────────────────────
 
 def momentum_backtest(
@@ -104,7 +443,10 @@ def momentum_backtest(
     fast_window: int = 10,
     slow_window: int = 30,
     rsi_window: int = 14,
-) -> BacktestResult:
+    dtype=np.float64,
+    details: bool = False,
+    bar_freq: str = "1d",
+) -> Union[BacktestResult, BacktestDetails]:
     """
     Momentum / trend-following strategy.
 
@@ -112,28 +454,26 @@ def momentum_backtest(
     Sell signal: Fast SMA crosses below Slow SMA OR RSI < 40
 
     Aggressive — favors trending markets, accepts high drawdowns.
+    `dtype=np.float32` computes the indicators in compact precision; the
+    portfolio itself is always simulated in float64. `details=True` returns
+    BacktestDetails (lazy equity curve, positions and trade ledger) instead.
+    `bar_freq` ("1d", "1h", "5m", "1m", ...) sets the annualization.
     """
-    fast_sma = sma(prices, fast_window)
-    slow_sma = sma(prices, slow_window)
-    rsi_values = rsi(prices, rsi_window)
-
-    signals = [0] * len(prices)
-    min_lookback = max(fast_window, slow_window, rsi_window + 1)
+    ind = _Indicators(prices, dtype, bar_freq=bar_freq)
+    signals = _momentum_strategy(ind, fast_window, slow_window, rsi_window)
+    return _simulate_portfolio(prices, signals, details=details, bar_freq=bar_freq)
 
-    for i in range(min_lookback, len(prices)):
-        if fast_sma[i] is None or slow_sma[i] is None or rsi_values[i] is None:
-            continue
 
-        # Buy: golden cross + RSI confirmation
-        if fast_sma[i] > slow_sma[i] and rsi_values[i] > 50:
-            signals[i] = 1
-        # Sell: death cross or RSI oversold warning
-        elif fast_sma[i] < slow_sma[i] or rsi_values[i] < 40:
-            signals[i] = 0
-        else:
-            signals[i] = signals[i - 1]  # Hold previous position
-
-    return _simulate_portfolio(prices, signals)
+def _momentum_strategy(
+    ind: _Indicators,
+    fast_window: int = 10,
+    slow_window: int = 30,
+    rsi_window: int = 14,
+) -> np.ndarray:
+    sma_trend = ind.sma_trend(fast_window, slow_window)
+    rsi_values = ind.rsi(rsi_window)
+    min_lookback = max(fast_window, slow_window, rsi_window + 1)
+    return ind.signals(_momentum_state(sma_trend, rsi_values, min_lookback))
 
 
 # ─── Conservative Strategy (Water Agent) ─────────────────────────────────────
@@ -143,7 +483,10 @@ def conservative_backtest(
     bb_window: int = 20,
     bb_std: float = 2.0,
     rsi_window: int = 14,
-) -> BacktestResult:
+    dtype=np.float64,
+    details: bool = False,
+    bar_freq: str = "1d",
+) -> Union[BacktestResult, BacktestDetails]:
     """
     Capital-preservation / mean-reversion strategy.
 
@@ -151,27 +494,23 @@ def conservative_backtest(
     Sell signal: Price near upper Bollinger Band OR RSI > 70 (overbought)
 
     Conservative — minimizes drawdown, favors sideways markets.
+    `dtype`, `details` and `bar_freq` behave as in `momentum_backtest`.
     """
-    upper, middle, lower = bollinger_bands(prices, bb_window, bb_std)
-    rsi_values = rsi(prices, rsi_window)
-
-    signals = [0] * len(prices)
-    min_lookback = max(bb_window, rsi_window + 1)
+    ind = _Indicators(prices, dtype, bar_freq=bar_freq)
+    signals = _conservative_strategy(ind, bb_window, bb_std, rsi_window)
+    return _simulate_portfolio(prices, signals, details=details, bar_freq=bar_freq)
 
-    for i in range(min_lookback, len(prices)):
-        if lower[i] is None or upper[i] is None or rsi_values[i] is None:
-            continue
 
-        # Buy: oversold near lower band
-        if prices[i] <= lower[i] * 1.02 and rsi_values[i] < 35:
-            signals[i] = 1
-        # Sell: overbought near upper band
-        elif prices[i] >= upper[i] * 0.98 or rsi_values[i] > 70:
-            signals[i] = 0
-        else:
-            signals[i] = signals[i - 1]  # Hold previous position
-
-    return _simulate_portfolio(prices, signals)
+def _conservative_strategy(
+    ind: _Indicators,
+    bb_window: int = 20,
+    bb_std: float = 2.0,
+    rsi_window: int = 14,
+) -> np.ndarray:
+    upper, middle, lower = ind.bollinger_bands(bb_window, bb_std)
+    rsi_values = ind.rsi(rsi_window)
+    min_lookback = max(bb_window, rsi_window + 1)
+    return ind.signals(_conservative_state(ind.prices, upper, lower, rsi_values, min_lookback))
 
 
 # ─── Adaptive Strategy (Grass Agent) ─────────────────────────────────────────
@@ -182,7 +521,10 @@ def adaptive_backtest(
     fast_window: int = 10,
     slow_window: int = 30,
     bb_window: int = 20,
-) -> BacktestResult:
+    dtype=np.float64,
+    details: bool = False,
+    bar_freq: str = "1d",
+) -> Union[BacktestResult, BacktestDetails]:
     """
     Regime-switching adaptive strategy.
 
@@ -192,57 +534,71 @@ def adaptive_backtest(
     - High volatility: Stay in cash
 
     Balanced — adjusts to market conditions, moderate risk.
+    `dtype`, `details` and `bar_freq` behave as in `momentum_backtest`.
     """
-    vol = rolling_volatility(prices, regime_window)
-    autocorr = autocorrelation(prices, regime_window)
-    fast_sma = sma(prices, fast_window)
-    slow_sma = sma(prices, slow_window)
-    upper, middle, lower = bollinger_bands(prices, bb_window)
-    rsi_values = rsi(prices)
-
-    signals = [0] * len(prices)
+    ind = _Indicators(prices, dtype, bar_freq=bar_freq)
+    signals = _adaptive_strategy(ind, regime_window, fast_window, slow_window, bb_window)
+    return _simulate_portfolio(prices, signals, details=details, bar_freq=bar_freq)
+
+
+def _adaptive_strategy(
+    ind: _Indicators,
+    regime_window: int = 30,
+    fast_window: int = 10,
+    slow_window: int = 30,
+    bb_window: int = 20,
+) -> np.ndarray:
+    vol = ind.rolling_volatility(regime_window)
+    autocorr = ind.autocorrelation(regime_window)
+    sma_trend = ind.sma_trend(fast_window, slow_window)
+    upper, middle, lower = ind.bollinger_bands(bb_window)
+    rsi_values = ind.rsi()
     min_lookback = max(regime_window + 1, slow_window, bb_window)
+    return ind.signals(_adaptive_state(
+        ind.prices, vol, autocorr, sma_trend, upper, lower, rsi_values, min_lookback,
+    ))
 
-    for i in range(min_lookback, len(prices)):
-        current_vol = vol[i]
-        current_autocorr = autocorr[i] if i < len(autocorr) else None
-
-        if current_vol is None:
-            continue
-
-        # Detect regime
-        if current_vol > 0.30:
-            # High volatility → stay in cash
-            signals[i] = 0
-        elif current_autocorr is not None and current_autocorr > 0.1:
-            # Positive autocorrelation → trending → use momentum
-            if fast_sma[i] is not None and slow_sma[i] is not None:
-                if fast_sma[i] > slow_sma[i]:
-                    signals[i] = 1
-                else:
-                    signals[i] = 0
-            else:
-                signals[i] = signals[i - 1]
-        else:
-            # Low autocorrelation → mean-reverting → use Bollinger
-            if lower[i] is not None and upper[i] is not None and rsi_values[i] is not None:
-                if prices[i] <= lower[i] * 1.02 and rsi_values[i] < 40:
-                    signals[i] = 1
-                elif prices[i] >= upper[i] * 0.98 or rsi_values[i] > 65:
-                    signals[i] = 0
-                else:
-                    signals[i] = signals[i - 1]
-            else:
-                signals[i] = signals[i - 1]
 
-    return _simulate_portfolio(prices, signals)
+# Strategy name → (signal builder, tunable parameters in call order)
+STRATEGIES = {
+    "momentum": (_momentum_strategy, ("fast_window", "slow_window", "rsi_window")),
+    "conservative": (_conservative_strategy, ("bb_window", "bb_std", "rsi_window")),
+    "adaptive": (_adaptive_strategy, ("regime_window", "fast_window", "slow_window", "bb_window")),
+}
+
+
+# ─── Strategy Suite ──────────────────────────────────────────────────────────
+
+def run_strategy_suite(
+    prices: list[float],
+    dtype=np.float64,
+    details: bool = False,
+    bar_freq: str = "1d",
+) -> dict[str, Union[BacktestResult, BacktestDetails]]:
+    """
+    Momentum, conservative and adaptive backtests of one ticker in one pass.
+
+    The prices are converted and fingerprinted once, and the union of the
+    three strategies' indicators (SMA 10/30, RSI 14, Bollinger 20, 30-bar
+    volatility and autocorrelation) is computed once and shared by all the
+    signal rules. Results are keyed by strategy name and equal the separate
+    `*_backtest(prices)` calls; `dtype`, `details` and `bar_freq` behave as
+    in `momentum_backtest`.
+    """
+    ind = _Indicators(prices, dtype, bar_freq=bar_freq)
+    arr = np.asarray(prices, dtype=float)
+    return {
+        name: _simulate_portfolio(arr, build_signals(ind), details=details, bar_freq=bar_freq)
+        for name, (build_signals, _) in STRATEGIES.items()
+    }
 
 
-def detect_regime(prices: list[float], window: int = 30) -> dict:
+def detect_regime(prices: list[float], window: int = 30, bar_freq: str = "1d") -> dict:
     """
     Detect the current market regime from price data.
 
     Returns a dict with regime info for the Grass agent's Reasoner to analyze.
+    Volatility and trend strength are annualized for `bar_freq` bars.
     """
     if len(prices) < window + 2:
         return {
@@ -256,7 +612,8 @@ def detect_regime(prices: list[float], window: int = 30) -> dict:
     returns = np.diff(np.log(arr))
     recent_returns = returns[-window:]
 
-    current_vol = float(np.std(recent_returns) * np.sqrt(252))
+    periods = periods_per_year(bar_freq)
+    current_vol = float(np.std(recent_returns) * np.sqrt(periods))
 
     # Autocorrelation
     if len(recent_returns) > 1:
@@ -272,7 +629,7 @@ def detect_regime(prices: list[float], window: int = 30) -> dict:
     recent_prices = arr[-window:]
     x = np.arange(window)
     slope = float(np.polyfit(x, recent_prices, 1)[0])
-    trend_strength = slope / np.mean(recent_prices) * 252  # Annualized
+    trend_strength = slope / np.mean(recent_prices) * periods  # Annualized
 
     # Classify regime
     if current_vol > 0.30:
@@ -288,3 +645,269 @@ def detect_regime(prices: list[float], window: int = 30) -> dict:
         "autocorrelation": round(float(current_autocorr), 4),
         "trend_strength": round(float(trend_strength), 4),
     }
+
+
+def rolling_regime(prices: list[float], window: int = 30, dtype=np.float64, bar_freq: str = "1d") -> dict:
+    """
+    Regime label for every bar, using the rules of `detect_regime`.
+
+    Bar i is labelled from prices[: i + 1] exactly as `detect_regime` would
+    label that history, but the whole series is done in one pass: volatility
+    and autocorrelation come from rolling moments, the trend from a
+    closed-form rolling OLS slope. Returns arrays keyed like detect_regime's
+    dict; bars with too little history are "unknown" with NaN metrics.
+    """
+    ind = _Indicators(prices, dtype, bar_freq=bar_freq)
+    volatility = np.array(ind.rolling_volatility(window), dtype=np.float64)
+    autocorr = np.nan_to_num(ind.autocorrelation(window - 1), nan=0.0).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trend_strength = ind.rolling_slope(window) / ind.sma(window) * periods_per_year(bar_freq)
+
+    trending = (np.abs(trend_strength) > 0.15) & (autocorr > 0.05)
+    regime = np.select(
+        [volatility > 0.30, trending & (trend_strength > 0), trending],
+        ["high_volatility", "trending_up", "trending_down"],
+        "mean_reverting",
+    )
+
+    unknown = min(window + 1, len(regime))
+    regime[:unknown] = "unknown"
+    for values in (volatility, autocorr, trend_strength):
+        values[:unknown] = np.nan
+    return {
+        "regime": regime,
+        "volatility": volatility,
+        "autocorrelation": autocorr,
+        "trend_strength": trend_strength,
+    }
+
+
+# ─── Walk-Forward Evaluation ─────────────────────────────────────────────────
+#
+# The strategy runs once over the whole history: indicators are computed (and
+# cached) once, and every window reads the same signals. Each test window is
+# then marked to market as a standalone account that inherits the live
+# position at its first bar. Total return, volatility and Sharpe come from
+# prefix sums of the strategy's per-bar returns in O(1) per window; drawdown
+# and trades only touch the window's own bars.
+
+class _ReturnPrefix:
+    """Prefix sums of a strategy's per-bar returns plus its trade segments."""
+
+    def __init__(self, prices: np.ndarray, positions: np.ndarray, bar_freq: str = "1d"):
+        self.prices = prices
+        self.periods = periods_per_year(bar_freq)
+        n = len(prices)
+        held = np.zeros(n)
+        held[1:] = positions[:-1]
+        bar_returns = np.zeros(n)
+        bar_returns[1:] = held[1:] * (prices[1:] / prices[:-1] - 1.0)
+        self.log_growth = np.concatenate(([0.0], np.cumsum(np.log1p(bar_returns))))
+        self.sum = np.concatenate(([0.0], np.cumsum(bar_returns)))
+        self.sum_sq = np.concatenate(([0.0], np.cumsum(bar_returns * bar_returns)))
+
+        entries, exits = _trade_indices(positions)
+        if len(exits) < len(entries):
+            exits = np.append(exits, n - 1)  # open trade marked at the last bar
+        self.entries = entries
+        self.exits = exits
+
+    def result(self, start: int, end: int) -> BacktestResult:
+        """Metrics of bars [start, end) as if the account opened at `start`."""
+        count = end - start - 1  # bar returns inside the window
+        total_return = float(np.expm1(self.log_growth[end] - self.log_growth[start + 1]))
+
+        growth = self.log_growth[start + 1 : end + 1]
+        drawdowns = np.expm1(growth - np.maximum.accumulate(growth))
+        max_drawdown = float(np.min(drawdowns))
+
+        volatility = sharpe = 0.0
+        if count > 0:
+            mean = (self.sum[end] - self.sum[start + 1]) / count
+            var = max((self.sum_sq[end] - self.sum_sq[start + 1]) / count - mean * mean, 0.0)
+            std = float(np.sqrt(var))
+            volatility = std * np.sqrt(self.periods)
+            if std > 0:
+                sharpe = float((mean - 0.04 / self.periods) / std * np.sqrt(self.periods))
+
+        # Trades held at any bar of the window, clipped to the window
+        first = int(np.searchsorted(self.exits, start, side="right"))
+        last = int(np.searchsorted(self.entries, end - 1, side="right"))
+        entry_prices = self.prices[np.maximum(self.entries[first:last], start)]
+        exit_prices = self.prices[np.minimum(self.exits[first:last], end - 1)]
+        trade_returns = (exit_prices - entry_prices) / entry_prices
+
+        return _backtest_result(
+            total_return, max_drawdown, volatility, sharpe, len(trade_returns), trade_returns,
+        )
+
+
+def walk_forward_backtest(
+    prices: list[float],
+    strategy: str = "momentum",
+    train_bars: int = 252,
+    test_bars: int = 63,
+    step: Optional[int] = None,
+    dtype=np.float64,
+    bar_freq: str = "1d",
+    **params,
+) -> list[WalkForwardWindow]:
+    """
+    Rolling train/test evaluation of one strategy.
+
+    Windows start after `train_bars` of history and advance by `step` bars
+    (default: `test_bars`, i.e. back-to-back test windows). Each record holds
+    the in-sample result for the `train_bars` before the test window and the
+    out-of-sample result for the test window itself. `params` are passed to
+    the strategy (e.g. fast_window=20 for momentum); `bar_freq` sets the
+    annualization.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+    if train_bars < 2 or test_bars < 2:
+        raise ValueError("train_bars and test_bars must be at least 2")
+    step = step or test_bars
+
+    build_signals, _ = STRATEGIES[strategy]
+    arr = np.asarray(prices, dtype=float)
+    positions = _positions(build_signals(_Indicators(prices, dtype, bar_freq=bar_freq), **params), len(arr))
+    prefix = _ReturnPrefix(arr, positions, bar_freq)
+
+    windows = []
+    for test_start in range(train_bars, len(arr) - test_bars + 1, step):
+        train_start = test_start - train_bars
+        test_end = test_start + test_bars
+        windows.append(WalkForwardWindow(
+            train_start=train_start,
+            test_start=test_start,
+            test_end=test_end,
+            train=prefix.result(train_start, test_start),
+            test=prefix.result(test_start, test_end),
+        ))
+    return windows
+
+
+# ─── Constrained Simulation ──────────────────────────────────────────────────
+#
+# Enforces execution constraints while the portfolio is simulated instead of
+# adjusting the metrics afterwards:
+#   - position cap: each entry invests only `position_cap` of current equity
+#   - stop loss: exit at the first close at or below entry × (1 − pct)
+#     ("fixed_pct") or the running high since entry × (1 − pct)
+#     ("trailing_pct"); after a stop the strategy waits for its signal to
+#     reset before it can re-enter
+#   - trade limit: at most `max_trades_per_day` entries per day (bar 0 opens
+#     a day of `bars_per_day` bars, by default the session length of the
+#     bar frequency: 1 for "1d", 7 for "1h", 390 for "1m"); blocked entries
+#     retry the next day
+#     while the signal still asks to be long. Exits are never blocked.
+# The loop below runs once per trade (or per blocked day); every per-bar step
+# — finding the next signal flip, scanning for a stop, filling the equity
+# curve — is an array operation over the trade's bars.
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """next_[i] = first j >= i with mask[j] (len(mask) if none); has a sentinel at n."""
+    n = len(mask)
+    idx = np.append(np.where(mask, np.arange(n), n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def _constrained_equity(
+    prices: np.ndarray,
+    positions: np.ndarray,
+    initial_capital: float,
+    position_cap: float,
+    stop_loss: str,
+    stop_pct: Optional[float],
+    max_trades_per_day: Optional[int],
+    bars_per_day: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    n = len(prices)
+    if n == 0:
+        return np.array([initial_capital]), np.array([])
+    use_stop = stop_loss != "none" and stop_pct is not None
+    next_long = _next_true(positions == 1)
+    next_flat = _next_true(positions == 0)
+
+    values = np.empty(n)
+    trade_returns = []
+    capital = initial_capital
+    filled = 0
+    search = 1
+    day, day_trades = -1, 0
+    while search < n:
+        entry = int(next_long[search])
+        if entry >= n:
+            break
+        if max_trades_per_day is not None:
+            if entry // bars_per_day != day:
+                day, day_trades = entry // bars_per_day, 0
+            if day_trades >= max_trades_per_day:
+                search = (day + 1) * bars_per_day  # retry once the next day opens
+                continue
+            day_trades += 1
+
+        invested = capital * position_cap
+        cash = capital - invested
+        shares = invested / prices[entry]
+
+        release = int(next_flat[entry + 1])  # bar where the signal goes flat
+        exit_ = min(release, n - 1)
+        if use_stop and exit_ > entry:
+            held = prices[entry + 1 : exit_ + 1]
+            if stop_loss == "trailing_pct":
+                reference = np.maximum.accumulate(prices[entry : exit_ + 1])[1:]
+            else:
+                reference = prices[entry]
+            hit = held <= reference * (1.0 - stop_pct)
+            if hit.any():
+                exit_ = entry + 1 + int(np.argmax(hit))
+
+        values[filled:entry] = capital
+        values[entry:exit_] = cash + shares * prices[entry:exit_]
+        capital = cash + shares * prices[exit_]
+        values[exit_] = capital
+        filled = exit_ + 1
+        trade_returns.append((prices[exit_] - prices[entry]) / prices[entry])
+        search = release  # a stopped-out trade waits for the signal to reset
+
+    values[filled:] = capital
+    return values, np.asarray(trade_returns, dtype=float)
+
+
+def constrained_backtest(
+    prices: list[float],
+    strategy: str = "momentum",
+    position_cap: float = 1.0,
+    stop_loss: str = "none",
+    stop_pct: Optional[float] = None,
+    max_trades_per_day: Optional[int] = None,
+    bars_per_day: Optional[int] = None,
+    dtype=np.float64,
+    bar_freq: str = "1d",
+    **params,
+) -> BacktestResult:
+    """
+    Backtest a strategy under execution constraints, enforced bar by bar.
+
+    stop_loss: "none", "fixed_pct" or "trailing_pct" (with `stop_pct` in 0..1).
+    max_trades_per_day: None for no limit; 0 disables trading.
+    bars_per_day: defaults to the session length of `bar_freq` bars.
+    With no constraints this equals the plain `*_backtest` result exactly.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+    if stop_loss not in ("none", "fixed_pct", "trailing_pct"):
+        raise ValueError(f"Unknown stop_loss {stop_loss!r}")
+
+    if bars_per_day is None:
+        bars_per_day = session_bars(bar_freq)
+
+    build_signals, _ = STRATEGIES[strategy]
+    arr = np.asarray(prices, dtype=float)
+    positions = _positions(build_signals(_Indicators(prices, dtype, bar_freq=bar_freq), **params), len(arr))
+    values, trade_returns = _constrained_equity(
+        arr, positions, 10000.0, float(position_cap), stop_loss, stop_pct,
+        max_trades_per_day, max(int(bars_per_day), 1),
+    )
+    return _summarize(values, trade_returns, len(trade_returns), 10000.0, bar_freq)
@@ -0,0 +1,344 @@
+"""
+MagiStock — Streaming Backtester (Skill utility)
+
+Backtests a price history that arrives piece by piece — an iterator of
+chunks too large to hold at once, or one new bar at a time as the market
+closes. Each piece is evaluated together with a short tail of the bars
+before it — enough for every rolling window the strategy uses — while the
+Wilder RSI averages, the last signal, the open position and the running
+metric accumulators carry over to the next. Work per bar is bounded by the
+strategy's longest window, not the history's length, and the result is the
+`BacktestResult` the in-memory `*_backtest` gives for the whole series.
+"""
+
+import inspect
+import sys
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .indicator_cache import IndicatorCache
+from .indicators import _recursive_filter, _rsi_from_averages, periods_per_year
+from .schemas import BacktestResult
+from .strategies import STRATEGIES, _fill_holds, _Indicators, _rounded_result
+
+
+# RSI window the adaptive rules use without exposing it as a parameter
+_FIXED_RSI_WINDOW = 14
+
+
+# ─── Chunk Indicators ────────────────────────────────────────────────────────
+
+class _ChunkIndicators(_Indicators):
+    """
+    Indicators for one chunk, computed over `head` tail bars plus the chunk.
+
+    Rolling windows only need the tail. RSI continues from the averages
+    carried in `rsi_state` (window → (avg_gain, avg_loss) at the last tail
+    bar) and leaves the chunk's closing averages in `rsi_next`. `signals`
+    drops the tail and resolves leading holds with the carried `signal`.
+    """
+
+    def __init__(
+        self,
+        prices: np.ndarray,
+        head: int,
+        signal: int,
+        rsi_state: dict,
+        dtype=np.float64,
+        bar_freq: str = "1d",
+    ):
+        super().__init__(prices, dtype, cache=IndicatorCache(max_bytes=sys.maxsize), bar_freq=bar_freq)
+        self.head = head
+        self.signal = signal
+        self.rsi_state = rsi_state
+        self.rsi_next: dict = {}
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        return self._get("rsi", self._continued_rsi, None, window)
+
+    def _continued_rsi(self, prices: np.ndarray, window: int, dtype=np.float64) -> np.ndarray:
+        out = np.full_like(prices, np.nan)
+        deltas = np.diff(prices)
+        gains = np.maximum(deltas, 0.0)
+        losses = np.maximum(-deltas, 0.0)
+
+        if window in self.rsi_state:
+            avg_gain, avg_loss = self.rsi_state[window]
+            first = self.head
+            avg_gain = _recursive_filter(gains[first - 1 :], 1.0 / window, avg_gain)
+            avg_loss = _recursive_filter(losses[first - 1 :], 1.0 / window, avg_loss)
+        elif len(prices) > window:
+            # Still seeding: the history so far is all in view, as in batch_rsi
+            first = window
+            avg_gain = np.empty_like(deltas[window - 1 :])
+            avg_loss = np.empty_like(avg_gain)
+            avg_gain[0] = gains[:window].mean(dtype=np.float64)
+            avg_loss[0] = losses[:window].mean(dtype=np.float64)
+            avg_gain[1:] = _recursive_filter(gains[window:], 1.0 / window, avg_gain[0])
+            avg_loss[1:] = _recursive_filter(losses[window:], 1.0 / window, avg_loss[0])
+        else:
+            return out
+
+        if len(avg_gain):
+            self.rsi_next[window] = (avg_gain[-1], avg_loss[-1])
+        out[first:] = _rsi_from_averages(avg_gain, avg_loss)
+        return out
+
+    def signals(self, state: np.ndarray) -> np.ndarray:
+        carried = np.array([self.signal], dtype=np.int8)
+        return _fill_holds(np.concatenate((carried, state[self.head :])))[1:]
+
+
+def _moments(values: np.ndarray) -> tuple[float, float]:
+    """Mean and population variance of one window; variance below rounding error is 0."""
+    mean = float(values.mean(dtype=np.float64))
+    d = values - mean
+    var = float(np.mean(d * d, dtype=np.float64))
+    scale = float(np.mean(values * values, dtype=np.float64))
+    return mean, var if var > 4 * len(values) * np.finfo(float).eps * scale else 0.0
+
+
+class _BarIndicators(_ChunkIndicators):
+    """
+    Indicators of a single appended bar, read straight off the tail.
+
+    Each indicator is one reduction over its own window and RSI is one Wilder
+    step, so the cost does not depend on how long the tail is. Only the last
+    entry of each array is filled; `signals` drops the rest.
+    """
+
+    def _last(self, value) -> np.ndarray:
+        out = np.full(len(self.prices), np.nan, dtype=self.dtype)
+        out[-1] = value
+        return out
+
+    def _returns(self, count: int) -> np.ndarray:
+        tail = np.log(self.prices[-count - 1 :], dtype=np.float64)
+        return np.diff(tail).astype(self.dtype, copy=False)
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._last(self.prices[-window:].mean(dtype=np.float64))
+
+    def bollinger_bands(self, window: int = 20, num_std: float = 2.0):
+        mean, var = _moments(self.prices[-window:])
+        band = float(num_std) * np.sqrt(var)
+        return self._last(mean + band), self._last(mean), self._last(mean - band)
+
+    def rolling_volatility(self, window: int = 20) -> np.ndarray:
+        _, var = _moments(self._returns(window))
+        return self._last(np.sqrt(var) * np.sqrt(periods_per_year(self.bar_freq)))
+
+    def autocorrelation(self, window: int = 20, lag: int = 1) -> np.ndarray:
+        returns = self._returns(window + lag)
+        x, y = returns[lag:], returns[:window]
+        mean_x, var_x = _moments(x)
+        mean_y, var_y = _moments(y)
+        cov = float(np.mean((x - mean_x) * (y - mean_y), dtype=np.float64))
+        denom = np.sqrt(var_x * var_y)
+        return self._last(cov / denom if denom > 0 else np.nan)
+
+    def rsi(self, window: int = 14) -> np.ndarray:
+        if window not in self.rsi_state:
+            return super().rsi(window)
+        avg_gain, avg_loss = self.rsi_state[window]
+        delta = self.prices[-1] - self.prices[-2]
+        alpha = 1.0 / window
+        avg_gain = avg_gain + alpha * (max(delta, 0.0) - avg_gain)
+        avg_loss = avg_loss + alpha * (max(-delta, 0.0) - avg_loss)
+        self.rsi_next[window] = (avg_gain, avg_loss)
+        return self._last(_rsi_from_averages(np.asarray(avg_gain), np.asarray(avg_loss)))
+
+
+# ─── Portfolio Book ──────────────────────────────────────────────────────────
+
+class _StreamBook:
+    """
+    All-in / all-out account advanced one chunk at a time.
+
+    Trades chain capital with the same float operations as the in-memory
+    simulator, so the equity curve is identical bar for bar; only the
+    running peak, drawdown, return moments and trade tallies are kept,
+    never the curve or the trade list.
+    """
+
+    def __init__(self, initial_capital: float = 10000.0):
+        self.initial_capital = initial_capital
+        self.capital = initial_capital  # cash after the last exit
+        self.shares = 0.0
+        self.entry_price = 0.0
+        self.position = 0
+        self.last_value: Optional[float] = None
+        self.last_price = 0.0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.closed_trades = 0
+        self.winning_trades = 0
+        self.trade_return_sum = 0.0
+        # Bar-return moments, merged chunk by chunk (Chan et al.)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, prices: np.ndarray, positions: np.ndarray) -> None:
+        step = np.diff(positions, prepend=np.int8(self.position))
+        entries, exits = step == 1, step == -1
+
+        share_levels = [self.shares]
+        cash_levels = [self.capital]
+        for bar in np.flatnonzero(entries | exits).tolist():
+            price = float(prices[bar])
+            if self.position:
+                self.capital = self.shares * price
+                self._close((price - self.entry_price) / self.entry_price)
+                cash_levels.append(self.capital)
+            else:
+                self.shares = self.capital / price
+                self.entry_price = price
+                share_levels.append(self.shares)
+            self.position = 1 - self.position
+
+        held = np.asarray(share_levels)[np.cumsum(entries)]
+        cash = np.asarray(cash_levels)[np.cumsum(exits)]
+        values = np.where(positions == 1, held * prices, cash)
+
+        peak = np.maximum.accumulate(np.concatenate(([self.peak], values)))[1:]
+        self.max_drawdown = min(self.max_drawdown, float(np.min((values - peak) / peak)))
+        self.peak = float(peak[-1])
+
+        curve = values if self.last_value is None else np.concatenate(([self.last_value], values))
+        returns = np.diff(curve) / curve[:-1]
+        self._merge(returns[~np.isnan(returns)])
+        self.last_value = float(values[-1])
+        self.last_price = float(prices[-1])
+
+    def _close(self, trade_return: float) -> None:
+        self.closed_trades += 1
+        self.winning_trades += trade_return > 0
+        self.trade_return_sum += trade_return
+
+    def _merge(self, returns: np.ndarray) -> None:
+        n = len(returns)
+        if not n:
+            return
+        mean = float(np.mean(returns))
+        m2 = float(np.sum((returns - mean) ** 2))
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def result(self, bar_freq: str = "1d") -> BacktestResult:
+        trades, wins, trade_sum = self.closed_trades, self.winning_trades, self.trade_return_sum
+        if self.position:  # open trade marked at the last bar
+            open_return = (self.last_price - self.entry_price) / self.entry_price
+            trades, wins, trade_sum = trades + 1, wins + (open_return > 0), trade_sum + open_return
+
+        final = self.initial_capital if self.last_value is None else self.last_value
+        total_return = (final - self.initial_capital) / self.initial_capital
+
+        periods = periods_per_year(bar_freq)
+        std = float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+        volatility = std * float(np.sqrt(periods))
+        sharpe = (self.mean - 0.04 / periods) / std * float(np.sqrt(periods)) if std > 0 else 0.0
+        return _rounded_result(
+            total_return, self.max_drawdown, volatility, sharpe, trades,
+            wins / trades if trades else 0.0, trade_sum / trades if trades else 0.0,
+        )
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+def _lookback(build_signals, params: dict) -> int:
+    """Tail bars that make every rolling window of the strategy exact (autocorrelation needs window + 2)."""
+    defaults = {
+        name: p.default
+        for name, p in inspect.signature(build_signals).parameters.items()
+        if p.default is not inspect.Parameter.empty
+    }
+    windows = [v for v in {**defaults, **params}.values() if isinstance(v, int)]
+    return max(windows + [_FIXED_RSI_WINDOW]) + 2
+
+
+class BacktestState:
+    """
+    Resumable backtest of one strategy.
+
+    `append` takes the next bar (or a chunk of bars) and `result` is the
+    backtest of everything appended so far, equal to the in-memory
+    `*_backtest` on the same prices. Appending costs time proportional to
+    the new bars plus the strategy's longest window, and reading `result`
+    is O(1). The state holds no reference to past prices beyond that tail
+    and pickles, so it can be saved and resumed when the next bar lands.
+    `params` go to the strategy (e.g. fast_window=20 for momentum);
+    `dtype` and `bar_freq` behave as in `momentum_backtest`.
+    """
+
+    def __init__(self, strategy: str = "momentum", dtype=np.float64, bar_freq: str = "1d", **params):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+        build_signals, names = STRATEGIES[strategy]
+        unknown = set(params) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown {strategy} parameters: {sorted(unknown)}")
+
+        self.strategy = strategy
+        self.params = params
+        self.dtype = np.dtype(dtype)
+        self.bar_freq = bar_freq
+        self.bars = 0
+        self._lookback = _lookback(build_signals, params)
+        self._tail = np.empty(0)
+        self._rsi_state: dict = {}
+        self._signal = 0
+        self._book = _StreamBook()
+
+    def append(self, prices) -> None:
+        """Advance the backtest by one bar or a sequence of bars."""
+        chunk = np.asarray(prices, dtype=float).ravel()
+        if not len(chunk):
+            return
+        window = np.concatenate((self._tail, chunk))
+        # A single bar on a full tail only needs the newest indicator values
+        single = len(chunk) == 1 and len(self._tail) == self._lookback
+        indicators = _BarIndicators if single else _ChunkIndicators
+        ind = indicators(window, len(self._tail), self._signal, self._rsi_state, self.dtype, self.bar_freq)
+        build_signals, _ = STRATEGIES[self.strategy]
+        signals = build_signals(ind, **self.params)
+        self._rsi_state.update(ind.rsi_next)
+
+        positions = signals.astype(np.int8)
+        if self.bars == 0:
+            positions[0] = 0  # the simulator is flat after bar 0
+        self._book.update(chunk, positions)
+
+        self._signal = int(signals[-1])
+        self._tail = window[-self._lookback :].copy()
+        self.bars += len(chunk)
+
+    @property
+    def result(self) -> BacktestResult:
+        return self._book.result(self.bar_freq)
+
+
+def stream_backtest(
+    chunks: Iterable[Iterable[float]],
+    strategy: str = "momentum",
+    dtype=np.float64,
+    bar_freq: str = "1d",
+    **params,
+) -> BacktestResult:
+    """
+    Backtest `strategy` over a price history delivered in consecutive chunks.
+
+    chunks: any iterable of 1-D price sequences (a generator reading a file
+            or a database cursor page by page); chunks may differ in length.
+    Memory is bounded by the largest chunk plus a tail of the longest window.
+    `params` go to the strategy (e.g. fast_window=20 for momentum);
+    `dtype` and `bar_freq` behave as in `momentum_backtest`.
+    """
+    state = BacktestState(strategy, dtype, bar_freq, **params)
+    for chunk in chunks:
+        state.append(chunk)
+    return state.result
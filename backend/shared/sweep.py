@@ -0,0 +1,70 @@
+"""
+MagiStock — Parameter Sweep (Skill utility)
+
+Grid search over strategy hyperparameters. Every combination runs the same
+signal rules and portfolio simulator as the public backtests, so a sweep row
+equals the matching `*_backtest(...)` call exactly. Each distinct indicator
+(an SMA window, an RSI window, a Bollinger window/width, ...) is computed
+once per sweep and reused by every combination that needs it.
+"""
+
+import itertools
+import sys
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .indicator_cache import IndicatorCache
+from .schemas import BacktestResult, SweepResult
+from .strategies import STRATEGIES, _Indicators, _simulate_portfolio
+
+
+def sweep_strategy(
+    prices: list[float],
+    strategy: str,
+    grid: dict[str, Iterable],
+    rank_by: str = "sharpe_ratio",
+    ascending: bool = False,
+    top: Optional[int] = None,
+    dtype=np.float64,
+    bar_freq: str = "1d",
+) -> list[SweepResult]:
+    """
+    Backtest every combination of `grid` and rank the results.
+
+    grid: parameter name → candidate values, e.g.
+          {"fast_window": [5, 10, 20], "slow_window": [30, 50]}.
+          Parameters left out keep the strategy's defaults.
+    rank_by: a BacktestResult field; ties keep grid order.
+    top: return only the best `top` rows.
+    bar_freq: bar size ("1d", "1h", "5m", ...) used for annualization.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+    build_signals, names = STRATEGIES[strategy]
+    unknown = set(grid) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown {strategy} parameters: {sorted(unknown)}")
+    if rank_by not in BacktestResult.model_fields:
+        raise ValueError(f"Cannot rank by {rank_by!r}")
+
+    gridded = [name for name in names if name in grid]
+    values = [list(grid[name]) for name in gridded]
+
+    # A private, unbounded cache: every window is computed exactly once and a
+    # large grid never evicts the live strategies' entries from the shared one.
+    ind = _Indicators(prices, dtype, cache=IndicatorCache(max_bytes=sys.maxsize), bar_freq=bar_freq)
+    arr = np.asarray(prices, dtype=float)
+
+    runs = []
+    for combo in itertools.product(*values):
+        params = dict(zip(gridded, combo))
+        runs.append((params, _simulate_portfolio(arr, build_signals(ind, **params), bar_freq=bar_freq)))
+
+    runs.sort(key=lambda run: getattr(run[1], rank_by), reverse=not ascending)
+    if top is not None:
+        runs = runs[:top]
+    return [
+        SweepResult(rank=i + 1, params=params, result=result)
+        for i, (params, result) in enumerate(runs)
+    ]
@@ -0,0 +1,134 @@
+"""
+MagiStock — Universe Backtester (Skill utility)
+
+Runs every ticker × {fire, water, grass} backtest on a process pool. The
+price matrix is written once into `multiprocessing.shared_memory`; workers
+attach to it by name and slice their rows in place, so no price list is ever
+pickled. Results stream back as each chunk of tickers finishes.
+"""
+
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .schemas import BacktestResult
+from .strategies import adaptive_backtest, conservative_backtest, momentum_backtest
+
+
+# Agent element → strategy
+STRATEGIES = {
+    "fire": momentum_backtest,
+    "water": conservative_backtest,
+    "grass": adaptive_backtest,
+}
+
+
+class UniverseResult(NamedTuple):
+    ticker: str
+    strategy: str
+    result: BacktestResult
+
+
+# ─── Shared Price Matrix ─────────────────────────────────────────────────────
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the parent's block; only the parent ever unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older Pythons register the attachment with the resource tracker the
+        # pool inherits from the parent, which already tracks this name.
+        return shared_memory.SharedMemory(name=name)
+
+
+_worker: dict = {}
+
+
+def _init_worker(name: str, shape: tuple[int, int], lengths: np.ndarray) -> None:
+    shm = _attach(name)
+    _worker["shm"] = shm  # keep the mapping alive for the worker's lifetime
+    _worker["matrix"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker["lengths"] = lengths
+
+
+def _run_rows(rows: Sequence[int], strategies: Sequence[str]) -> list[tuple[int, str, BacktestResult]]:
+    """Backtest a chunk of tickers; rows are zero-copy views of the shared matrix."""
+    matrix, lengths = _worker["matrix"], _worker["lengths"]
+    out = []
+    for row in rows:
+        prices = matrix[row, : lengths[row]]
+        for name in strategies:  # one ticker's strategies share its cached indicators
+            out.append((row, name, STRATEGIES[name](prices)))
+    return out
+
+
+# ─── Runner ──────────────────────────────────────────────────────────────────
+
+def backtest_universe(
+    prices: dict[str, Sequence[float]],
+    strategies: Sequence[str] = ("fire", "water", "grass"),
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[UniverseResult]:
+    """
+    Backtest every ticker in `prices` with each strategy, yielding results in
+    completion order (not input order).
+
+    Histories may have different lengths. `max_workers=1` runs in-process;
+    the default uses every core. `chunk_size` is tickers per task (default:
+    about four tasks per worker, so stragglers don't idle the pool).
+    """
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"Unknown strategies: {sorted(unknown)}; expected {sorted(STRATEGIES)}")
+
+    tickers = list(prices)
+    if not tickers or not strategies:
+        return
+    workers = max_workers or os.cpu_count() or 1
+    lengths = np.array([len(prices[t]) for t in tickers], dtype=np.int64)
+    shape = (len(tickers), max(int(lengths.max()), 1))
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(tickers) / (workers * 4)))
+    chunks = [range(i, min(i + chunk_size, len(tickers))) for i in range(0, len(tickers), chunk_size)]
+
+    shm = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 8)
+    matrix = None
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for row, ticker in enumerate(tickers):
+            matrix[row, : lengths[row]] = prices[ticker]
+
+        if workers == 1:
+            _worker.update(matrix=matrix, lengths=lengths)
+            try:
+                for chunk in chunks:
+                    for row, name, result in _run_rows(chunk, strategies):
+                        yield UniverseResult(tickers[row], name, result)
+            finally:
+                _worker.clear()
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(shm.name, shape, lengths),
+        ) as pool:
+            pending = {pool.submit(_run_rows, chunk, tuple(strategies)) for chunk in chunks}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for row, name, result in future.result():
+                            yield UniverseResult(tickers[row], name, result)
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        del matrix
+        shm.close()
+        shm.unlink()
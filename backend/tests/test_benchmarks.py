@@ -0,0 +1,24 @@
+import json
+import sys
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+from benchmarks.bench import run_suite
+
+
+def test_benchmark_suite_fast_paths_agree_with_reference_oracles():
+    report = run_suite(bars=(300, 1_500), assets=(1, 4), repeat=1, oracle_bars=1_000)
+    json.dumps(report)
+
+    failures = [(r["name"], r["bars"], r["oracle"]) for r in report["results"] if not r["oracle"]["ok"]]
+    assert not failures
+    names = {r["name"] for r in report["results"]}
+    assert {"momentum_backtest", "batch_rsi", "rsi_tail", "_simulate_portfolio"} <= names
+    assert {"rolling_slope_array", "batch_rolling_slope", "rolling_regime"} <= names
+    assert {"walk_forward_backtest", "constrained_backtest", "run_strategy_suite"} <= names
+    assert all(r["oracle"]["checked"] for r in report["results"])
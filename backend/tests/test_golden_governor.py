@@ -131,3 +131,47 @@ async def test_low_confidence_never_auto_disables():
     assert fire.constraints.position_cap_pct <= 0.05
     assert fire.constraints.max_trade_freq_per_day == 0
 
+
+
+@pytest.mark.asyncio
+async def test_events_share_streaming_indicators_and_seed_once(monkeypatch):
+    import sqlite3
+    from datetime import datetime
+
+    from shared.market_data import _generate_synthetic_data
+
+    fetches = []
+
+    def fetch(asset, period_days):
+        fetches.append(asset)
+        return _generate_synthetic_data(asset, period_days)
+
+    monkeypatch.setattr(skills_mod, "_fetch_prices", fetch)
+    with tempfile.TemporaryDirectory() as td:
+        db_path = str(Path(td) / "rg.sqlite")
+        engine = _build_engine(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        with conn:
+            insert_case(
+                conn,
+                case_id="case_stream",
+                asset="SPY",
+                persona_id="p1",
+                created_at=datetime.utcnow().isoformat(),
+                inputs=CaseCreateRequest(asset="SPY", persona={"persona_id": "p1"}).model_dump(),
+            )
+
+        async def drawdown(**event) -> float:
+            decision = await engine.process_market_event(
+                case_id="case_stream", event=MarketEvent(asset="SPY", **event)
+            )
+            return decision.regime.evidence["max_drawdown"]
+
+        seeded = await drawdown(event_type="heartbeat")
+        last = _generate_synthetic_data("SPY", 252)[-1]
+        crashed = await drawdown(event_type="crash_signal", severity=0.9, close=last * 0.4)
+        assert crashed < seeded
+        # Events without a close read the state as is: the crash close is kept
+        assert await drawdown(event_type="vol_spike") == crashed
+        assert fetches == ["SPY"]
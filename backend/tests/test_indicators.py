@@ -0,0 +1,299 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+from shared.indicators import (
+    BARS_PER_DAY,
+    BARS_PER_YEAR,
+    COMPACT,
+    _recursive_filter,
+    autocorrelation,
+    autocorrelation_tail,
+    autocorrelations_array,
+    batch_autocorrelation,
+    batch_bollinger_bands,
+    batch_ema,
+    batch_macd,
+    batch_rolling_slope,
+    batch_rolling_volatility,
+    batch_rsi,
+    batch_sma,
+    bollinger_bands,
+    bollinger_bands_tail,
+    ema,
+    ema_tail,
+    macd,
+    periods_per_year,
+    rolling_slope_array,
+    rolling_volatility,
+    rolling_volatility_tail,
+    rsi,
+    rsi_array,
+    rsi_tail,
+    session_bars,
+    sma,
+    sma_array,
+    sma_tail,
+)
+
+
+def _gbm(n: int, seed: int = 7, start: float = 450.0) -> list[float]:
+    rng = np.random.RandomState(seed)
+    return (start * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))).tolist()
+
+
+# Per-window reference implementations (the original loop formulations).
+
+def _ref_window_stat(values, window, fn):
+    return [fn(values[i - window + 1 : i + 1]) if i >= window - 1 else None for i in range(len(values))]
+
+
+def _assert_series_close(actual, expected, rtol=1e-9, atol=1e-12):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert a is None
+        else:
+            assert a == pytest.approx(e, rel=rtol, abs=atol)
+
+
+@pytest.mark.parametrize("n", [5, 252, 20_000])
+@pytest.mark.parametrize("window", [1, 10, 30])
+def test_sma_and_bollinger_match_per_window_reference(n, window):
+    prices = _gbm(n)
+    arr = np.array(prices)
+
+    _assert_series_close(sma(prices, window), _ref_window_stat(arr, window, lambda w: float(np.mean(w))))
+
+    upper, middle, lower = bollinger_bands(prices, window, 2.0)
+    std = _ref_window_stat(arr, window, lambda w: float(np.std(w)))
+    mean = _ref_window_stat(arr, window, lambda w: float(np.mean(w)))
+    _assert_series_close(middle, mean)
+    _assert_series_close(upper, [m + 2.0 * s if m is not None else None for m, s in zip(mean, std)])
+    _assert_series_close(lower, [m - 2.0 * s if m is not None else None for m, s in zip(mean, std)])
+
+
+@pytest.mark.parametrize("n", [10, 252, 20_000])
+def test_rolling_volatility_matches_per_window_reference(n):
+    prices = _gbm(n)
+    returns = np.diff(np.log(np.array(prices)))
+    window = 20
+
+    expected = [None] * n
+    for i in range(window, len(returns) + 1):
+        expected[i] = float(np.std(returns[i - window : i]) * np.sqrt(252))
+
+    _assert_series_close(rolling_volatility(prices, window), expected)
+
+
+def test_rolling_kernel_constant_series_has_zero_band_width():
+    upper, middle, lower = bollinger_bands([100.0] * 50, 20)
+    assert upper[19:] == middle[19:] == lower[19:]
+    assert middle[-1] == 100.0
+
+
+def _as_array(series):
+    return np.array([np.nan if v is None else v for v in series], dtype=float)
+
+
+def test_batch_api_matches_single_series_on_ragged_histories():
+    lengths = [300, 300, 180, 40, 12]
+    n = max(lengths)
+    matrix = np.full((len(lengths), n), np.nan)
+    rows = []
+    for r, length in enumerate(lengths):
+        row = _gbm(length, seed=r)
+        matrix[r, n - length :] = row
+        rows.append(row)
+
+    cases = [
+        (lambda m: batch_sma(m, 20), lambda p: sma(p, 20)),
+        (lambda m: batch_ema(m, 12), lambda p: ema(p, 12)),
+        (lambda m: batch_rsi(m, 14), lambda p: rsi(p, 14)),
+        (lambda m: batch_bollinger_bands(m, 20)[0], lambda p: bollinger_bands(p, 20)[0]),
+        (lambda m: batch_rolling_volatility(m, 20), lambda p: rolling_volatility(p, 20)),
+        (lambda m: batch_autocorrelation(m, 20), lambda p: autocorrelation(p, 20)),
+    ]
+    for batch_fn, single_fn in cases:
+        out = batch_fn(matrix)
+        assert out.shape == matrix.shape
+        for r, row in enumerate(rows):
+            expected = np.concatenate([np.full(n - len(row), np.nan), _as_array(single_fn(row))])
+            np.testing.assert_allclose(out[r], expected, rtol=1e-9, atol=1e-12)
+
+
+def test_batch_windows_touching_a_gap_are_nan():
+    matrix = np.array([_gbm(60)])
+    matrix[0, 30] = np.nan
+    out = batch_sma(matrix, 5)
+    assert np.isnan(out[0, 30:35]).all()
+    assert not np.isnan(out[0, 35:]).any()
+
+
+def test_array_api_is_float64_with_nan_warmup():
+    prices = _gbm(60)
+    out = sma_array(prices, 10)
+    assert out.dtype == np.float64 and out.shape == (60,)
+    assert np.isnan(out[:9]).all() and not np.isnan(out[9:]).any()
+    assert np.isnan(rsi_array(prices[:10], 14)).all()
+    assert sma(prices, 10)[:9] == [None] * 9
+
+
+def test_macd_signal_line_starts_at_first_valid_macd():
+    prices = _gbm(120)
+    macd_line, signal_line = macd(prices, 12, 26, 9)
+
+    fast, slow = ema(prices, 12), ema(prices, 26)
+    expected_macd = [f - s if f is not None and s is not None else None for f, s in zip(fast, slow)]
+    valid = [v for v in expected_macd if v is not None]
+    expected_signal = [None] * 25 + ema(valid, 9)
+
+    _assert_series_close(macd_line, expected_macd)
+    _assert_series_close(signal_line, expected_signal)
+    assert macd(prices[:30])[1] == [None] * 30
+
+
+@pytest.mark.parametrize("n", [30, 252, 5_000])
+def test_multi_lag_autocorrelation_matches_corrcoef_reference(n):
+    prices = _gbm(n, seed=11)
+    returns = np.diff(np.log(np.array(prices)))
+    window = 20
+    out = autocorrelations_array(prices, window, lags=(1, 2, 3, 4, 5))
+
+    for lag in range(1, 6):
+        expected = [None] * n
+        for i in range(window + lag, len(returns) + 1):
+            expected[i] = float(np.corrcoef(returns[i - window : i], returns[i - window - lag : i - lag])[0, 1])
+        _assert_series_close([None if np.isnan(v) else v for v in out[lag]], expected, rtol=1e-8, atol=1e-10)
+        if lag == 1:
+            _assert_series_close(autocorrelation(prices, window), expected, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize("window", [2, 30, 600])
+def test_rolling_slope_matches_polyfit_per_window(window):
+    prices = _gbm(2000)
+    expected = _ref_window_stat(prices, window, lambda w: np.polyfit(np.arange(len(w)), w, 1)[0])
+    actual = [None if np.isnan(v) else float(v) for v in rolling_slope_array(prices, window)]
+    _assert_series_close(actual, expected, rtol=1e-7, atol=1e-8)
+
+    ragged = np.array([prices, [np.nan] * 50 + prices[:-50]])
+    slopes = batch_rolling_slope(ragged, window)
+    assert np.isnan(slopes[1, : 50 + window - 1]).all()
+    np.testing.assert_allclose(slopes[1, 50 + window - 1 :], slopes[0, window - 1 : -50], rtol=1e-7, atol=1e-8)
+
+
+def test_autocorrelation_of_flat_stretch_is_undefined():
+    prices = _gbm(40) + [500.0] * 40
+    assert autocorrelation(prices, 20)[-1] is None
+
+
+@pytest.mark.parametrize("alpha", [1.0, 2.0 / 3.0, 2.0 / 27.0, 1.0 / 14.0, 2.0 / 201.0])
+def test_recursive_filter_matches_stepwise_recursion_in_1d_and_2d(alpha):
+    rng = np.random.RandomState(5)
+    x = rng.normal(0.0, 1.0, (3, 20_000)) + np.array([[450.0], [0.0], [-3.0]])
+    init = np.array([450.0, 0.0, 1.0])
+
+    expected = np.empty_like(x)
+    prev = init.copy()
+    for t in range(x.shape[1]):
+        prev = (x[:, t] - prev) * alpha + prev
+        expected[:, t] = prev
+
+    np.testing.assert_allclose(_recursive_filter(x, alpha, init), expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(_recursive_filter(x[0], alpha, init[0]), expected[0], rtol=1e-12)
+
+
+def test_ema_and_rsi_match_stepwise_reference_on_long_series():
+    prices = _gbm(50_000)
+    arr = np.array(prices)
+
+    window = 26
+    mult = 2.0 / (window + 1)
+    expected_ema = [None] * len(prices)
+    expected_ema[window - 1] = float(np.mean(arr[:window]))
+    for i in range(window, len(arr)):
+        expected_ema[i] = (arr[i] - expected_ema[i - 1]) * mult + expected_ema[i - 1]
+    _assert_series_close(ema(prices, window), expected_ema, rtol=1e-11)
+
+    window = 14
+    deltas = np.diff(arr)
+    gains, losses = np.maximum(deltas, 0.0), np.maximum(-deltas, 0.0)
+    avg_gain, avg_loss = float(np.mean(gains[:window])), float(np.mean(losses[:window]))
+    expected_rsi = [None] * len(prices)
+    expected_rsi[window] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    for i in range(window, len(deltas)):
+        avg_gain = (avg_gain * (window - 1) + gains[i]) / window
+        avg_loss = (avg_loss * (window - 1) + losses[i]) / window
+        expected_rsi[i + 1] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    _assert_series_close(rsi(prices, window), expected_rsi, rtol=1e-11)
+
+
+def test_tail_evaluation_matches_last_value_of_full_series():
+    prices = _gbm(3_000)
+
+    assert sma_tail(prices, 20) == pytest.approx(sma(prices, 20)[-1], rel=1e-12)
+    assert rolling_volatility_tail(prices, 20) == pytest.approx(rolling_volatility(prices, 20)[-1], rel=1e-9)
+    assert autocorrelation_tail(prices, 20) == pytest.approx(autocorrelation(prices, 20)[-1], rel=1e-8)
+    for got, full in zip(bollinger_bands_tail(prices, 20), bollinger_bands(prices, 20)):
+        assert got == pytest.approx(full[-1], rel=1e-12)
+
+    # Bounded warm-up: close by default, exact once the warm-up spans the history
+    assert rsi_tail(prices, 14) == pytest.approx(rsi(prices, 14)[-1], abs=1e-4)
+    assert ema_tail(prices, 12) == pytest.approx(ema(prices, 12)[-1], rel=1e-6)
+    assert rsi_tail(prices, 14, warmup=len(prices)) == pytest.approx(rsi(prices, 14)[-1], rel=1e-12)
+
+    assert rsi_tail(prices[:14], 14) is None
+    assert sma_tail(prices[:5], 20) is None
+
+
+def test_compact_float32_policy_stays_within_documented_bounds():
+    rng = np.random.RandomState(9)
+    matrix = 450.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, (50, 2_000)), axis=1))
+
+    def check(fn, rtol=0.0, atol=0.0):
+        full, compact = fn(np.float64), fn(COMPACT)
+        for f, c in zip(full if isinstance(full, tuple) else (full,), compact if isinstance(compact, tuple) else (compact,)):
+            assert c.dtype == np.float32
+            assert np.array_equal(np.isnan(f), np.isnan(c))
+            ok = ~np.isnan(f)
+            np.testing.assert_allclose(c[ok], f[ok], rtol=rtol, atol=atol)
+
+    check(lambda dt: batch_sma(matrix, 20, dtype=dt), rtol=1e-6)
+    check(lambda dt: batch_ema(matrix, 12, dtype=dt), rtol=1e-6)
+    check(lambda dt: batch_bollinger_bands(matrix, 20, dtype=dt)[1], rtol=1e-6)
+    check(lambda dt: (lambda b: b[0] - b[2])(batch_bollinger_bands(matrix, 20, dtype=dt)), rtol=1e-4)
+    check(lambda dt: batch_rolling_volatility(matrix, 20, dtype=dt), rtol=1e-4)
+    check(lambda dt: batch_rsi(matrix, 14, dtype=dt), atol=1e-2)
+    check(lambda dt: batch_autocorrelation(matrix, 20, dtype=dt), atol=1e-4)
+    check(lambda dt: batch_macd(matrix, dtype=dt)[0], atol=1e-3)
+
+
+def test_bar_frequency_annualization_and_long_intraday_windows():
+    assert periods_per_year("1d") == 252 and periods_per_year("1m") == 252 * 390
+    for freq, bars in BARS_PER_DAY.items():  # one session model for annualization and daily limits
+        assert session_bars(freq) == bars and periods_per_year(freq) == BARS_PER_YEAR[freq] == 252 * bars
+    with pytest.raises(ValueError):
+        periods_per_year("2d")
+
+    prices = _gbm(200_000, seed=11)
+    window = 390 * 10  # ten sessions of 1-minute bars
+    vol = rolling_volatility(prices[-2 * window :], window, bar_freq="1m")
+    daily = rolling_volatility(prices[-2 * window :], window)
+    assert vol[-1] == pytest.approx(daily[-1] * np.sqrt(390), rel=1e-12)
+    assert rolling_volatility_tail(prices, window, bar_freq="1m") == pytest.approx(vol[-1], rel=1e-9)
+
+    # Blocks grow with the window, so long windows stay exact on long series
+    from shared.indicators import rolling_volatility_array
+    full = rolling_volatility_array(prices, window, bar_freq="5m")
+    returns = np.diff(np.log(prices))
+    for i in (window, 123_457, len(prices) - 1):
+        expected = np.std(returns[i - window : i]) * np.sqrt(periods_per_year("5m"))
+        assert full[i] == pytest.approx(expected, rel=1e-9)
@@ -0,0 +1,158 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+from shared import market_data
+from shared.fetch_cache import FetchCache
+from shared.market_data import _generate_synthetic_data, fetch_market_data, market_data_cache
+from shared.price_store import PriceStore
+
+
+def test_price_store_serves_zero_copy_slices(tmp_path):
+    store = PriceStore(tmp_path)
+    prices = _generate_synthetic_data("SPY", 300)
+    assert store.read("SPY", 10) is None
+
+    store.write("spy", prices)
+    window = store.read("SPY", 252)
+    assert isinstance(window.base, np.memmap) and not window.flags.writeable
+    assert np.array_equal(window, prices[-252:])
+    assert np.shares_memory(window, store.read("SPY", 300))
+
+    assert store.read("SPY", 301) is None  # not enough history stored
+    assert PriceStore(tmp_path).entry("SPY")["bars"] == 300  # index visible to other processes
+
+
+def test_fetch_goes_remote_only_for_missing_or_stale_data(tmp_path, monkeypatch):
+    calls = []
+
+    def remote(ticker, period_days):
+        calls.append(period_days)
+        return _generate_synthetic_data(ticker, period_days)
+
+    monkeypatch.setattr(market_data, "_fetch_from_yfinance", remote)
+    store = PriceStore(tmp_path)
+    market_data_cache.clear()
+
+    first = fetch_market_data("QQQ", 500, store=store)
+    assert calls == [500] and len(first) == 500
+    again = fetch_market_data("QQQ", 252, store=store)
+    assert calls == [500] and np.array_equal(again, first[-252:])
+
+    store.max_age = -1  # everything is stale
+    market_data_cache.clear()
+    fetch_market_data("QQQ", 252, store=store)
+    assert calls == [500, 500]  # refresh keeps the longer stored history
+
+    def offline(ticker, period_days):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(market_data, "_fetch_from_yfinance", offline)
+    market_data_cache.clear()
+    assert np.array_equal(fetch_market_data("QQQ", 100, store=store), first[-100:])
+    assert np.array_equal(fetch_market_data("IWM", 50, store=store), _generate_synthetic_data("IWM", 50))
+
+
+def test_short_provider_history_is_served_up_to_the_requested_size(tmp_path, monkeypatch):
+    calls = []
+
+    def remote(ticker, period_days):
+        calls.append(period_days)
+        # Listed too recently for more than 300 bars; short windows lose a holiday
+        return _generate_synthetic_data(ticker, min(period_days - 1, 300))
+
+    monkeypatch.setattr(market_data, "_fetch_from_yfinance", remote)
+    store = PriceStore(tmp_path)
+    market_data_cache.clear()
+
+    first = fetch_market_data("ARM", 500, store=store)
+    market_data_cache.clear()
+    assert np.array_equal(fetch_market_data("ARM", 500, store=store), first)
+    assert calls == [500] and len(first) == 300
+    assert store.entry("ARM")["requested"] == 500 and len(store.read("ARM", 500)) == 300
+    assert store.read("ARM", 501) is None
+
+    assert len(fetch_market_data("SPY", 20, store=store)) == 19
+    assert len(fetch_market_data("SPY", 252, store=store)) == 251  # not capped at the short window
+    assert calls == [500, 20, 252]
+
+
+def _write_tickers(root, tickers):
+    store = PriceStore(root)
+    for ticker in tickers:
+        store.write(ticker, np.arange(10.0))
+
+
+def test_price_store_index_keeps_entries_from_concurrent_processes(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    groups = [[f"T{p}_{i}" for i in range(20)] for p in range(4)]
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_write_tickers, [tmp_path] * len(groups), groups))
+    index = PriceStore(tmp_path)
+    assert all(index.entry(t) is not None for group in groups for t in group)
+
+
+def test_fetch_cache_expires_evicts_and_coalesces_concurrent_loads():
+    now = [0.0]
+    cache = FetchCache(ttl=10, max_entries=2, max_bytes=10**6, clock=lambda: now[0])
+    cache.get_or_fetch("a", lambda: np.zeros(10))
+    assert cache.get_or_fetch("a", lambda: np.ones(10))[0] == 0.0
+    now[0] = 11.0  # expired
+    assert cache.get_or_fetch("a", lambda: np.ones(10))[0] == 1.0
+    cache.get_or_fetch("b", lambda: 1)
+    cache.get_or_fetch("c", lambda: 2)  # evicts "a", the least recently used
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return np.arange(252.0)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("SPY", slow_fetch))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(results) == 8
+    assert all(r is results[0] for r in results)
+
+
+def test_fetch_market_data_serves_repeats_from_memory(tmp_path, monkeypatch):
+    calls = []
+
+    def remote(ticker, period_days):
+        calls.append(ticker)
+        return _generate_synthetic_data(ticker, period_days)
+
+    monkeypatch.setattr(market_data, "_fetch_from_yfinance", remote)
+    monkeypatch.setattr(market_data, "market_data_cache", FetchCache())
+    store = PriceStore(tmp_path)
+    first = fetch_market_data("SPY", 252, store=store)
+    assert fetch_market_data("spy", 252, store=store) is first
+    assert calls == ["SPY"] and market_data.market_data_cache.stats()["hits"] == 1
+
+    def offline(ticker, period_days):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(market_data, "_fetch_from_yfinance", offline)
+    lower = fetch_market_data("iwm", 100, store=store)  # synthetic, whichever spelling comes first
+    assert np.array_equal(lower, _generate_synthetic_data("IWM", 100))
+    assert fetch_market_data("IWM", 100, store=store) is lower
@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 
@@ -46,3 +47,23 @@ def test_run_backtest_returns_metrics(app):
     assert "total_return" in out["metrics"]
     assert "max_drawdown" in out["metrics"]
 
+
+
+def test_streaming_indicator_state_matches_compute_indicators(app):
+    rng = np.random.RandomState(3)
+    prices = (100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.015, 2500)))).tolist()
+
+    compute = app._skills["risk-governor.skills.compute_indicators"].fn
+    update = app._skills["risk-governor.skills.update_indicators"].fn
+
+    # Seeded with the engine's 252-bar history, then 50 new daily closes
+    assert update(asset="SPY", prices=prices[-302:-50]) is None
+    update(asset="SPY", prices=prices[-302:-50], seed=True)
+    for p in prices[-50:]:
+        streamed = update(asset="SPY", prices=[p])
+
+    batch = compute(prices=prices[-252:])
+    assert batch["max_drawdown"] != compute(prices=prices[-302:])["max_drawdown"]
+    for key in ("volatility", "max_drawdown", "momentum_20d", "rsi_14"):
+        assert streamed[key] == pytest.approx(batch[key], abs=1e-2 if key == "rsi_14" else 1e-4)
+    assert streamed["trend_slope"] == pytest.approx(batch["trend_slope"], abs=1e-6)
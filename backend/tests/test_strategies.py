@@ -0,0 +1,353 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+from shared.indicator_cache import IndicatorCache, indicator_cache
+from shared.market_data import _generate_synthetic_data
+from shared.strategies import adaptive_backtest, conservative_backtest, momentum_backtest
+
+
+@pytest.fixture()
+def prices():
+    return _generate_synthetic_data("SPY", 504)
+
+
+def test_backtests_share_cached_indicators(prices):
+    indicator_cache.clear()
+    first = momentum_backtest(prices)
+    misses = indicator_cache.stats()["misses"]
+
+    conservative_backtest(prices)  # RSI-14 already cached by momentum
+    adaptive_backtest(prices)  # SMA-10/30, RSI-14 and BB-20 already cached
+    stats = indicator_cache.stats()
+    assert stats["hits"] >= 4
+    assert stats["misses"] == misses + 1 + 2
+
+    assert momentum_backtest(prices) == first
+    cached = indicator_cache.get_or_compute("x", "y", (), lambda: np.zeros(3))
+    with pytest.raises(ValueError):
+        cached[0] = 1.0
+
+
+def test_indicator_cache_evicts_least_recently_used_by_size():
+    cache = IndicatorCache(max_bytes=3 * 800)
+    for key in "abc":
+        cache.get_or_compute(key, "arr", (), lambda: np.zeros(100))
+    cache.get_or_compute("a", "arr", (), lambda: np.zeros(100))  # refresh "a"
+    cache.get_or_compute("d", "arr", (), lambda: np.zeros(100))  # evicts "b"
+
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1 and stats["bytes"] <= 2400
+    cache.get_or_compute("b", "arr", (), lambda: np.zeros(100))
+    assert cache.stats()["misses"] == 5 and cache.stats()["hits"] == 1
+
+
+def test_compact_dtype_backtest_uses_separate_cache_entries(prices):
+    indicator_cache.clear()
+    full = momentum_backtest(prices)
+    compact = momentum_backtest(prices, dtype=np.float32)
+    assert indicator_cache.stats()["hits"] == 0
+    assert compact.total_return == pytest.approx(full.total_return, abs=0.05)
+
+
+def test_vectorized_simulator_matches_reference_loop(prices):
+    from benchmarks.reference import simulate_portfolio
+    from shared.strategies import _simulate_portfolio
+
+    rng = np.random.default_rng(7)
+    for n in (0, 1, 2, 50, len(prices)):
+        for length in (n, max(n - 5, 0)):
+            signals = rng.choice([-1, 0, 1, 1, 2], size=length).tolist()
+            expected = simulate_portfolio(prices[:n], signals)
+            assert _simulate_portfolio(prices[:n], signals) == expected
+
+
+def test_vectorized_signals_match_reference_strategies():
+    from benchmarks import reference as ref
+
+    for ticker, n in (("BTC", 40), ("QQQ", 300), ("IWM", 1000)):
+        p = _generate_synthetic_data(ticker, n)
+        assert momentum_backtest(p, 5, 20, 7) == ref.momentum_backtest(p, 5, 20, 7)
+        assert conservative_backtest(p, 10, 1.5, 7) == ref.conservative_backtest(p, 10, 1.5, 7)
+        assert adaptive_backtest(p, 15, 5, 20, 10) == ref.adaptive_backtest(p, 15, 5, 20, 10)
+
+
+def _tick_prices(seed, tick, n=600):
+    """A random walk in whole ticks (cents or dollars), as quoted prices are."""
+    steps = np.random.default_rng(seed).integers(-2, 3, n)
+    return np.round(100.0 + np.cumsum(steps) * tick, 2).tolist()
+
+
+def test_sma_crossover_ties_on_rounded_prices_match_reference():
+    from benchmarks import reference as ref
+
+    # Rounded prices give fast and slow SMAs that are exactly equal on some bars
+    for seed, tick in ((52, 0.01), (56, 0.01), (18, 1.0), (29, 1.0)):
+        p = _tick_prices(seed, tick)
+        assert momentum_backtest(p) == ref.momentum_backtest(p)
+        assert adaptive_backtest(p) == ref.adaptive_backtest(p)
+
+
+def test_sma_tie_recheck_runs_in_bounded_batches(monkeypatch):
+    from benchmarks import reference as ref
+    from shared import strategies
+
+    # Flat stretches make almost every bar a near-tie; re-check them a few at a time
+    monkeypatch.setattr(strategies, "_TIE_BATCH_ELEMENTS", 64)
+    walk = _tick_prices(56, 0.01, 400)
+    p = walk[:200] + [walk[199]] * 200 + walk[200:]
+    with np.errstate(invalid="ignore"):  # the reference's corrcoef over flat returns
+        assert momentum_backtest(p) == ref.momentum_backtest(p)
+        assert adaptive_backtest(p) == ref.adaptive_backtest(p)
+
+
+def test_parameter_sweep_ranks_combinations_and_matches_backtests(prices):
+    from shared.sweep import sweep_strategy
+
+    grid = {"fast_window": [5, 10, 20], "slow_window": [30, 50], "rsi_window": [7, 14]}
+    indicator_cache.clear()
+    rows = sweep_strategy(prices, "momentum", grid)
+    assert indicator_cache.stats()["misses"] == 0  # sweep uses a private cache
+
+    assert len(rows) == 12 and [r.rank for r in rows] == list(range(1, 13))
+    sharpes = [r.result.sharpe_ratio for r in rows]
+    assert sharpes == sorted(sharpes, reverse=True)
+    for row in rows:
+        assert row.result == momentum_backtest(prices, **row.params)
+
+    best = sweep_strategy(prices, "conservative", {"bb_std": [1.5, 2.0]}, rank_by="max_drawdown", top=1)
+    assert len(best) == 1 and best[0].params.keys() == {"bb_std"}
+    assert best[0].result == conservative_backtest(prices, bb_std=best[0].params["bb_std"])
+
+    with pytest.raises(ValueError):
+        sweep_strategy(prices, "momentum", {"bb_window": [20]})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_universe_backtester_streams_every_ticker_and_strategy(workers):
+    from shared.universe import backtest_universe
+
+    universe = {t: _generate_synthetic_data(t, n) for t, n in (("SPY", 300), ("BTC", 120), ("QQQ", 500))}
+    results = {(r.ticker, r.strategy): r.result for r in backtest_universe(universe, max_workers=workers, chunk_size=1)}
+
+    assert len(results) == 9
+    assert results[("BTC", "fire")] == momentum_backtest(universe["BTC"])
+    assert results[("SPY", "water")] == conservative_backtest(universe["SPY"])
+    assert results[("QQQ", "grass")] == adaptive_backtest(universe["QQQ"])
+
+
+def test_walk_forward_windows_match_standalone_simulation(prices):
+    from shared.strategies import _Indicators, _momentum_strategy, _positions, _simulate_portfolio, walk_forward_backtest
+
+    windows = walk_forward_backtest(prices, "momentum", train_bars=126, test_bars=42, fast_window=5)
+    assert [w.test_start for w in windows] == list(range(126, len(prices) - 41, 42))
+    assert all(w.test_end - w.test_start == 42 and w.test_start - w.train_start == 126 for w in windows)
+
+    # A window that opens flat is exactly a fresh backtest of its slice
+    signals = _momentum_strategy(_Indicators(prices), fast_window=5)
+    positions = _positions(signals, len(prices))
+    checked = 0
+    for w in windows:
+        if positions[w.test_start] == 0 and w.test.trades:
+            expected = _simulate_portfolio(prices[w.test_start:w.test_end], signals[w.test_start:w.test_end])
+            got = w.test
+            assert got.trades == expected.trades and got.win_rate == expected.win_rate
+            for field in ("total_return", "max_drawdown", "volatility", "avg_trade_return"):
+                assert getattr(got, field) == pytest.approx(getattr(expected, field), abs=1.01e-4)
+            assert got.sharpe_ratio == pytest.approx(expected.sharpe_ratio, abs=0.011)
+            checked += 1
+    assert checked
+
+    assert len(walk_forward_backtest(prices, "adaptive", train_bars=252, test_bars=63, step=21)) == 10
+
+
+def test_backtest_details_expose_equity_positions_and_trade_ledger(prices):
+    from shared.strategies import TRADE_DTYPE
+
+    details = momentum_backtest(prices, details=True)
+    assert "_curve" not in vars(details)  # nothing simulated until asked
+    assert details.result == momentum_backtest(prices)
+
+    equity, ledger = details.equity_curve, details.trades
+    assert equity.shape == (len(prices),) and equity[0] == 10000.0
+    assert details.positions.dtype == np.int8 and ledger.dtype == TRADE_DTYPE
+    assert len(ledger) == details.result.trades
+    assert np.all(details.positions[ledger["entry"]] == 1) and np.all(ledger["exit"] > ledger["entry"])
+    p = np.asarray(prices)
+    np.testing.assert_allclose(ledger["return"], p[ledger["exit"]] / p[ledger["entry"]] - 1)
+    with pytest.raises(ValueError):
+        equity[0] = 0.0
+
+
+def test_constrained_simulation_matches_bar_by_bar_reference(prices):
+    from benchmarks.reference import constrained_equity
+    from shared.strategies import _constrained_equity, constrained_backtest
+
+    arr = np.asarray(prices)
+    rng = np.random.default_rng(11)
+    positions = np.repeat(rng.integers(0, 2, len(arr) // 3 + 1), 3)[: len(arr)].astype(np.int8)
+    positions[0] = 0
+    for cap, stop, pct, limit, bpd in (
+        (0.5, "none", None, 100, 1),
+        (1.0, "fixed_pct", 0.01, 1, 8),
+        (0.25, "trailing_pct", 0.015, 2, 16),
+        (1.0, "trailing_pct", 0.0, 0, 1),
+    ):
+        values, returns = _constrained_equity(arr, positions, 10000.0, cap, stop, pct, limit, bpd)
+        ref_values, ref_returns = constrained_equity(arr, positions, cap, stop, pct, limit, bpd)
+        np.testing.assert_allclose(values, ref_values, rtol=1e-12)
+        np.testing.assert_allclose(returns, ref_returns, rtol=1e-12)
+
+    assert constrained_backtest(prices, "adaptive", max_trades_per_day=1) == adaptive_backtest(prices)
+    capped = constrained_backtest(prices, "momentum", position_cap=0.5)
+    assert abs(capped.max_drawdown) < abs(momentum_backtest(prices).max_drawdown)
+
+
+def test_rolling_regime_labels_every_bar_like_detect_regime(prices):
+    from shared.strategies import detect_regime, rolling_regime
+
+    labels = rolling_regime(prices, window=20)
+    assert labels["regime"].shape == (len(prices),)
+    assert set(labels["regime"][:21]) == {"unknown"} and np.isnan(labels["volatility"][:21]).all()
+    for i in range(0, len(prices), 7):
+        expected = detect_regime(prices[: i + 1], window=20)
+        assert labels["regime"][i] == expected["regime"]
+        if expected["regime"] != "unknown":
+            for key in ("volatility", "autocorrelation", "trend_strength"):
+                assert labels[key][i] == pytest.approx(expected[key], abs=1.01e-4)
+
+
+def test_monte_carlo_percentiles_are_chunk_invariant_and_match_simulator(prices):
+    from shared.monte_carlo import _path_metrics, bootstrap_paths, monte_carlo
+    from shared.strategies import _Indicators, _adaptive_strategy, _simulate_portfolio
+
+    paths = bootstrap_paths(prices, 4, block=10, rng=np.random.default_rng(5))
+    assert paths.shape == (4, len(prices)) and np.all(paths[:, 0] == prices[0])
+    signals = _adaptive_strategy(_Indicators(paths))
+    metrics = _path_metrics(paths, signals)
+    for i in range(4):
+        assert np.array_equal(signals[i], _adaptive_strategy(_Indicators(paths[i])))
+        single = _simulate_portfolio(paths[i], signals[i])
+        assert round(metrics["max_drawdown"][i], 4) == pytest.approx(single.max_drawdown, abs=1e-4)
+        assert round(metrics["sharpe_ratio"][i], 2) == pytest.approx(single.sharpe_ratio, abs=0.01)
+        assert metrics["trades"][i] == single.trades
+
+    whole = monte_carlo(prices, "momentum", n_paths=60, seed=3)
+    chunked = monte_carlo(prices, "momentum", n_paths=60, seed=3, max_bytes=len(prices) * 8 * 24 * 7)
+    assert whole == chunked
+    table = whole.percentiles["sharpe_ratio"]
+    assert table["p5"] <= table["p50"] <= table["p95"]
+    assert monte_carlo(prices, "conservative", n_paths=10, method="gbm").paths == 10
+
+
+def test_intraday_bar_frequency_rescales_annualized_metrics(prices):
+    from shared.strategies import constrained_backtest, detect_regime
+
+    daily = momentum_backtest(prices)
+    minute = momentum_backtest(prices, bar_freq="1m")
+    assert minute.total_return == daily.total_return and minute.trades == daily.trades
+    assert minute.volatility == pytest.approx(daily.volatility * np.sqrt(390), rel=1e-3)
+
+    regime = detect_regime(prices, bar_freq="1h")
+    assert regime["volatility"] == pytest.approx(detect_regime(prices)["volatility"] * np.sqrt(7), rel=1e-3)
+
+    # Hourly sessions have 7 bars, so one entry per day binds where it did not on daily bars
+    limited = constrained_backtest(prices, "momentum", max_trades_per_day=1, bar_freq="1h")
+    assert limited.trades <= daily.trades
+
+
+def test_streaming_backtest_matches_in_memory_result():
+    from shared.streaming import stream_backtest
+
+    prices = _generate_synthetic_data("QQQ", 700)
+    for size in (1, 45, 700):
+        chunks = (prices[i : i + size] for i in range(0, len(prices), size))
+        assert stream_backtest(chunks, "momentum", fast_window=5) == momentum_backtest(prices, fast_window=5)
+
+    chunks = [prices[:10], [], prices[10:333], prices[333:]]
+    assert stream_backtest(chunks, "conservative") == conservative_backtest(prices)
+    assert stream_backtest(iter(chunks), "adaptive", bar_freq="1h") == adaptive_backtest(prices, bar_freq="1h")
+
+    # A falling market never triggers an entry: flat equity has a Sharpe of 0 on both paths
+    falling = np.linspace(200.0, 100.0, 254).tolist()
+    idle = momentum_backtest(falling)
+    assert idle.trades == 0 and idle.sharpe_ratio == 0.0
+    assert stream_backtest([falling[:77], falling[77:]], "momentum") == idle
+
+    with pytest.raises(ValueError):
+        stream_backtest(chunks, "momentum", bb_window=20)
+
+
+def test_streaming_backtest_matches_on_rounded_prices_in_uneven_chunks():
+    from benchmarks import reference as ref
+    from shared.streaming import stream_backtest
+
+    rng = np.random.default_rng(5)
+    for seed, tick in ((52, 0.01), (56, 0.01), (18, 1.0), (29, 1.0)):
+        p = _tick_prices(seed, tick)
+        cuts = np.sort(rng.choice(np.arange(1, len(p)), 17, replace=False))
+        chunks = np.split(np.asarray(p), cuts)
+        assert stream_backtest(chunks, "momentum") == ref.momentum_backtest(p)
+        assert stream_backtest(chunks, "adaptive") == ref.adaptive_backtest(p)
+
+
+def test_strategy_suite_shares_indicators_across_strategies(prices):
+    from shared.strategies import run_strategy_suite
+
+    indicator_cache.clear()
+    results = run_strategy_suite(prices)
+    assert indicator_cache.stats()["misses"] == 6  # SMA 10/30, RSI, BB, volatility, autocorrelation
+
+    assert list(results) == ["momentum", "conservative", "adaptive"]
+    assert results["momentum"] == momentum_backtest(prices)
+    assert results["conservative"] == conservative_backtest(prices)
+    assert results["adaptive"] == adaptive_backtest(prices)
+    assert run_strategy_suite(prices, details=True)["adaptive"].result == results["adaptive"]
+
+
+def test_backtest_state_appends_bars_incrementally(prices):
+    import pickle
+
+    from shared.streaming import BacktestState
+
+    state = BacktestState("adaptive")
+    state.append(prices[:300])
+    state = pickle.loads(pickle.dumps(state))  # resumed from storage
+    for k in range(301, len(prices) + 1):
+        state.append(prices[k - 1])
+        if k % 50 == 0:
+            assert state.result == adaptive_backtest(prices[:k])
+    assert state.bars == len(prices) and state.result == adaptive_backtest(prices)
+
+    momentum = BacktestState("momentum", fast_window=5)
+    for price in prices[:200]:
+        momentum.append(price)
+    assert momentum.result == momentum_backtest(prices[:200], fast_window=5)
+
+    falling = np.linspace(200.0, 100.0, 254)  # never enters: Sharpe 0 on both paths
+    idle = BacktestState("momentum")
+    idle.append(falling)
+    assert idle.result == momentum_backtest(falling.tolist()) and idle.result.trades == 0
+
+
+def test_backtest_state_appends_match_on_rounded_prices():
+    from benchmarks import reference as ref
+    from shared.streaming import BacktestState
+
+    for seed, tick in ((56, 0.01), (18, 1.0)):
+        p = _tick_prices(seed, tick)
+        momentum, adaptive = BacktestState("momentum"), BacktestState("adaptive")
+        for k, price in enumerate(p, start=1):
+            momentum.append(price)
+            adaptive.append(price)
+            if k % 150 == 0:
+                assert momentum.result == ref.momentum_backtest(p[:k]) == momentum_backtest(p[:k])
+                assert adaptive.result == ref.adaptive_backtest(p[:k]) == adaptive_backtest(p[:k])